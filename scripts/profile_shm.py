@@ -8,71 +8,252 @@ statistical health metrics in JSON format.
 
 import argparse
 import asyncio
+import concurrent.futures
 import json
 import os
 import signal
-import statistics
-import subprocess
 import sys
+import threading
 import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Union
 from urllib.request import urlopen
 from urllib.error import URLError
 
 import cv2
 import numpy as np
 
-# Add src/capture to sys.path
+# Add src/capture (and src/common/src, which real_shared_memory imports) to sys.path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "capture"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "common" / "src"))
 try:
-    from real_shared_memory import RealSharedMemory
+    from real_shared_memory import ZeroCopyFrame, ZeroCopySharedMemory
+    from hb_mem_bindings import HbMemGraphicBuffer, init_module as hb_mem_init, import_nv12_graph_buf
 except ImportError:
-    print("Error: Could not import RealSharedMemory. Ensure src/capture is in PYTHONPATH.")
+    print("Error: Could not import ZeroCopySharedMemory. Ensure src/capture is in PYTHONPATH.")
     sys.exit(1)
 
 # New shared memory names (Option B design)
 SHM_NAME_BRIGHTNESS = "/pet_camera_brightness"  # Lightweight brightness data
 
+# Content check reads every Nth row/column only; the black-screen threshold
+# (avg_luma < 10) does not need a full-frame reduction.
+LUMA_SAMPLE_STEP = 8
+
+# Only the run-wide mean luma is reported, so ~32 samples evenly spaced in
+# time over the window are enough, whatever the camera's frame rate.
+LUMA_TARGET_SAMPLES = 32
+
+# Waiting for the writer to publish a new frame: spin on the header briefly
+# (catches a write that is already in flight), then poll with a sleep that
+# doubles up to the 5 ms period of the original poll loop (~8 wakeups per
+# frame at 30 fps)
+FRAME_SPIN_SEC = 50e-6
+FRAME_POLL_MIN_SEC = 0.001
+FRAME_POLL_MAX_SEC = 0.005
+
+# I-frame saves queued or running at once. Each holds its own NV12 copy
+# (~3 MB at 1080p); frames due while all slots are busy are skipped.
+IFRAME_MAX_PENDING = 4
+
 
 def find_switcher_daemon_pid() -> Optional[int]:
-    """Find the PID of camera_switcher_daemon using pgrep"""
+    """Find the PID of camera_switcher_daemon by scanning /proc/<pid>/cmdline"""
     try:
-        result = subprocess.run(
-            ["pgrep", "-f", "camera_switcher_daemon"],
-            capture_output=True,
-            text=True,
-            timeout=2
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            pid = int(result.stdout.strip().split('\n')[0])
-            return pid
-    except (subprocess.TimeoutExpired, ValueError, FileNotFoundError) as e:
+        pids = sorted(int(name) for name in os.listdir("/proc") if name.isdigit())
+    except OSError as e:
         print(f"[Error] Failed to find camera_switcher_daemon PID: {e}", file=sys.stderr)
+        return None
+
+    own_pid = os.getpid()
+    for pid in pids:  # Lowest PID first, same as pgrep
+        if pid == own_pid:
+            continue
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                if b"camera_switcher_daemon" in f.read():
+                    return pid
+        except OSError:
+            continue  # Process exited or is not readable
     return None
 
 
+def wait_for_new_frame(shm: ZeroCopySharedMemory, last_frame_number: int,
+                       timeout_sec: float) -> Optional[ZeroCopyFrame]:
+    """
+    Block until the writer publishes a frame other than last_frame_number.
+
+    Only the SHM header is read while waiting; the VIO buffer behind it is
+    imported by the caller, and only when a frame is actually inspected.
+    new_frame_sem is not used: it is a counting semaphore consumed by the
+    detector, and waiting on it here would steal the detector's wakeups.
+
+    Returns:
+        The latest frame (possibly unchanged if the timeout expired), or None
+        if nothing has been published yet
+    """
+    now = time.monotonic()
+    deadline = now + timeout_sec
+
+    # Short spin before the first sleep: a sleep costs at least one scheduler tick
+    spin_until = min(now + FRAME_SPIN_SEC, deadline)
+    while time.monotonic() < spin_until:
+        frame = shm.get_frame()
+        if frame is not None and frame.frame_number != last_frame_number:
+            return frame
+
+    poll = FRAME_POLL_MIN_SEC
+    while True:
+        frame = shm.get_frame()
+        now = time.monotonic()
+        if (frame is not None and frame.frame_number != last_frame_number) or now >= deadline:
+            return frame
+        time.sleep(min(poll, deadline - now))
+        poll = min(poll * 2, FRAME_POLL_MAX_SEC)
+
+
+def make_luma_sampler(width: int, height: int) -> Callable[[HbMemGraphicBuffer], float]:
+    """
+    Build the per-frame luma estimator for an NV12 resolution.
+
+    Resolved once on the first frame so the sampling loop does not re-derive
+    shapes per frame (the resolution is fixed for a given SHM region).
+    """
+    step = LUMA_SAMPLE_STEP
+
+    def luma_nv12(hb_buf: HbMemGraphicBuffer) -> float:
+        # (rows, stride) view of the Y-plane: row padding and vstride rows are sliced off
+        y_plane = hb_buf.get_plane_array(0, shaped=True)
+        if y_plane.ndim != 2 or y_plane.shape[0] < height or y_plane.shape[1] < width:
+            raise ValueError(f"Y-plane {y_plane.shape} does not hold {width}x{height}")
+        y_sub = y_plane[:height, :width][::step, ::step]
+        # Integer accumulation: mean() would upcast every sample to float64
+        return int(y_sub.sum(dtype=np.uint32)) / y_sub.size
+    return luma_nv12
+
+
+# Per-thread BGR output buffers for nv12_to_bgr, keyed by (height, width).
+# Thread-local because the I-frame executor converts on several workers.
+_bgr_buffers = threading.local()
+
+
+def _get_bgr_buffer(width: int, height: int) -> np.ndarray:
+    buf = getattr(_bgr_buffers, "buf", None)
+    if buf is None or buf.shape[:2] != (height, width):
+        buf = np.empty((height, width, 3), dtype=np.uint8)
+        _bgr_buffers.buf = buf
+    return buf
+
+
 def nv12_to_bgr(nv12_data: bytes, width: int, height: int) -> np.ndarray:
-    """Convert NV12 format to BGR for OpenCV"""
+    """
+    Convert NV12 format to BGR for OpenCV.
+
+    The result is written into a reused per-thread buffer, so it is only
+    valid until the next call on the same thread; copy it to keep it.
+    """
     y_plane_size = width * height
     uv_plane_size = width * height // 2
 
     if len(nv12_data) < y_plane_size + uv_plane_size:
         raise ValueError(f"NV12 data size mismatch: expected {y_plane_size + uv_plane_size}, got {len(nv12_data)}")
 
-    nv12 = np.frombuffer(nv12_data[:y_plane_size + uv_plane_size], dtype=np.uint8)
+    # count= bounds the view; slicing the bytes first would copy the whole frame
+    nv12 = np.frombuffer(nv12_data, dtype=np.uint8, count=y_plane_size + uv_plane_size)
     yuv = nv12.reshape((height * 3 // 2, width))
-    bgr = cv2.cvtColor(yuv, cv2.COLOR_YUV2BGR_NV12)
+    # dst= avoids a fresh (h, w, 3) allocation per saved frame
+    return cv2.cvtColor(yuv, cv2.COLOR_YUV2BGR_NV12, dst=_get_bgr_buffer(width, height))
+
+
+class RunningStats:
+    """Single-pass mean/variance (Welford), so the sampler keeps no per-frame lists."""
+
+    __slots__ = ("n", "mean", "_m2")
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, x: float) -> None:
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self._m2 += delta * (x - self.mean)
+
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation (0.0 with fewer than two values)"""
+        return (self._m2 / (self.n - 1)) ** 0.5 if self.n > 1 else 0.0
+
+
+def save_iframe_jpeg(nv12_data: bytes, width: int, height: int, filepath: Path) -> bool:
+    """Convert an NV12 frame to JPEG on disk. Runs on the I-frame executor."""
+    try:
+        bgr = nv12_to_bgr(nv12_data, width, height)
+        return bool(cv2.imwrite(str(filepath), bgr, [cv2.IMWRITE_JPEG_QUALITY, 95]))
+    except Exception:
+        return False  # Silently ignore save errors
+
 
-    return bgr
+class IframeSaver:
+    """
+    Writes I-frames as JPEG on a small worker pool.
+
+    At most max_pending saves are queued or running; submit() skips (and
+    counts) a frame instead of copying it while the pool is full, so a slow
+    disk cannot grow the queue without bound.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = IFRAME_MAX_PENDING) -> None:
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._futures: List[concurrent.futures.Future] = []
+        self.skipped = 0
+
+    @property
+    def submitted(self) -> int:
+        return len(self._futures)
+
+    def submit(self, y_arr: np.ndarray, uv_arr: np.ndarray, y_size: int,
+               width: int, height: int, filepath: Path) -> bool:
+        """Copy the NV12 planes and queue the save. False if the frame was skipped."""
+        if not self._slots.acquire(blocking=False):
+            self.skipped += 1
+            return False
+        try:
+            # Contiguous planes: y_arr already spans Y+UV
+            if len(y_arr) == y_size + len(uv_arr):
+                nv12_data = y_arr.tobytes()
+            else:
+                nv12_data = y_arr.tobytes() + uv_arr.tobytes()
+            # Copied out above: the VIO buffer is recycled once released
+            future = self._executor.submit(self._save, nv12_data, width, height, filepath)
+        except BaseException:
+            self._slots.release()
+            raise
+        self._futures.append(future)
+        return True
+
+    def _save(self, nv12_data: bytes, width: int, height: int, filepath: Path) -> bool:
+        try:
+            return save_iframe_jpeg(nv12_data, width, height, filepath)
+        finally:
+            self._slots.release()  # Before the future completes, so waiters see the slot
+
+    def close(self) -> int:
+        """Wait for pending saves and return how many were written."""
+        saved = sum(f.result() for f in self._futures)
+        self._executor.shutdown()
+        return saved
 
 
 async def check_http_endpoint(url: str, timeout: float = 2.0) -> Dict:
     """
     Check if an HTTP endpoint is responsive.
     """
-    start_time = time.time()
+    start_time = time.monotonic()
     try:
         # Use run_in_executor for blocking I/O
         loop = asyncio.get_running_loop()
@@ -80,7 +261,7 @@ async def check_http_endpoint(url: str, timeout: float = 2.0) -> Dict:
             None, 
             lambda: urlopen(url, timeout=timeout).getcode()
         )
-        latency_ms = (time.time() - start_time) * 1000
+        latency_ms = (time.monotonic() - start_time) * 1000
         return {
             "url": url,
             "available": True,
@@ -95,77 +276,154 @@ async def check_http_endpoint(url: str, timeout: float = 2.0) -> Dict:
         }
 
 
+def open_shm(shm_name: str) -> Union[ZeroCopySharedMemory, Dict]:
+    """Open the zero-copy frame SHM, returning it or an error result dict."""
+    # Frame pixels live in VIO buffers referenced by share_id, not in the SHM
+    if not hb_mem_init():
+        return {
+            "status": "ERROR",
+            "error": "hb_mem module initialization failed",
+            "target_shm": shm_name
+        }
+    shm = ZeroCopySharedMemory(shm_name)
+    if not shm.open():
+        return {
+            "status": "ERROR",
+            "error": f"Failed to open zero-copy SHM {shm_name}",
+            "target_shm": shm_name
+        }
+    return shm
+
+
 async def profile_shm(shm_name: str, duration: float, monitor_url: Optional[str] = None,
                       save_iframes: bool = False, output_dir: Optional[Path] = None,
                       test_switching: bool = False) -> Dict:
     """
     Sample shared memory and calculate metrics. Optionally check monitor URL and save I-frames.
     """
-    shm = RealSharedMemory(frame_shm_name=shm_name)
+    shm = open_shm(shm_name)
+    if isinstance(shm, dict):
+        return shm
     try:
-        shm.open()
-    except Exception as e:
-        return {
-            "status": "ERROR",
-            "error": str(e),
-            "target_shm": shm_name
-        }
+        return await _sample(shm, shm_name, duration, monitor_url, save_iframes,
+                             output_dir, test_switching)
+    finally:
+        shm.close()
+
+
+async def _sample(shm: ZeroCopySharedMemory, shm_name: str, duration: float,
+                  monitor_url: Optional[str] = None, save_iframes: bool = False,
+                  output_dir: Optional[Path] = None, test_switching: bool = False) -> Dict:
+    """
+    Run one sampling window on an already opened SHM and build the result.
 
+    The caller owns the mapping, so several windows can share one open().
+    The frame loop runs synchronously on a worker thread while the monitor
+    check stays on the event loop, so no per-frame event-loop round-trip
+    is needed.
+    """
     # Start monitor check task if URL provided
     monitor_task = None
     if monitor_url:
         monitor_task = asyncio.create_task(check_http_endpoint(monitor_url))
+    end_time = time.monotonic() + duration
+
+    result = await asyncio.to_thread(_sample_frames, shm, shm_name, duration, save_iframes,
+                                     output_dir, test_switching)
+
+    # Get monitor result if available
+    monitor_result = None
+    if monitor_task:
+        # Don't let a slow monitor hold up a short sampling window past a small grace period
+        try:
+            monitor_result = await asyncio.wait_for(
+                monitor_task, timeout=max(0.1, end_time - time.monotonic() + 0.5)
+            )
+        except asyncio.TimeoutError:  # wait_for has already cancelled the check
+            monitor_result = {"url": monitor_url, "available": False, "error": "timeout"}
+
+    if result["status"] == "NO_DATA":
+        result["monitor_check"] = monitor_result
+    elif monitor_result:
+        result["monitor_check"] = monitor_result
+        if not monitor_result.get("available"):
+            result["status"] = "PARTIAL_OUTAGE" if result["status"] == "HEALTHY" else result["status"]
+
+    return result
+
 
-    start_time = time.time()
+def _sample_frames(shm: ZeroCopySharedMemory, shm_name: str, duration: float,
+                   save_iframes: bool, output_dir: Optional[Path], test_switching: bool) -> Dict:
+    """Blocking frame loop and SHM-side result for _sample (runs on a worker thread)."""
+    # Monotonic clock for the deadline and sample times (immune to NTP steps)
+    start_time = time.monotonic()
     end_time = start_time + duration
 
-    frame_timestamps: List[float] = []
-    frame_numbers: List[int] = []
-    frame_sizes: List[int] = []
+    # Streaming per-frame statistics: O(1) memory however long the window
+    interval_stats = RunningStats()  # Seconds between received frames
+    size_stats = RunningStats()
+    dropped_frames = 0  # Sum of frame_number gaps between received frames
+    total_frames = 0
     last_frame_number = -1
+    last_sample_time = None
 
     # Metadata from first valid frame
     resolution = "unknown"
-    frame_format = "unknown"
 
     # Content check samples
-    luma_samples: List[float] = []
+    luma_stats = RunningStats()
+    sample_luma: Optional[Callable[[HbMemGraphicBuffer], float]] = None
+    import_errors = 0
+    unsampled_frames = 0  # Luma check due but the Y-plane could not be read
+    luma_interval = duration / LUMA_TARGET_SAMPLES
+    next_luma_time = start_time  # First frame is always sampled
+    save_nv12 = False
 
     # Camera switching detection
-    camera_ids: List[int] = []
     switch_events: List[Dict] = []
+    camera_frame_counts: Dict[int, int] = {}
     last_camera_id = None
 
-    # I-frame saving
+    # I-frame saving (convert + JPEG encode off the sampling loop)
     saved_iframe_count = 0
+    iframe_saver: Optional[IframeSaver] = None
     if save_iframes and output_dir:
         output_dir.mkdir(parents=True, exist_ok=True)
+        iframe_saver = IframeSaver()
+    # Wall-clock prefix taken once; files are ordered by a sequence number after it
+    save_base = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-    # Record initial write_index for accurate FPS calculation
-    initial_write_index = shm.get_write_index()
+    # Record initial frame_number for accurate FPS calculation
+    initial_frame = shm.get_frame()
+    initial_frame_number = initial_frame.frame_number if initial_frame else 0
 
     print(f"Sampling {shm_name} for {duration}s...", file=sys.stderr)
 
     last_frame_obj = None
 
-    while time.time() < end_time:
-        frame = shm.get_latest_frame()
+    now = start_time
+    while now < end_time:
+        # Wait until the writer publishes (the frame already published is taken first)
+        frame = wait_for_new_frame(shm, last_frame_number, end_time - now)
+        now = time.monotonic()
 
         if frame and frame.frame_number != last_frame_number:
             last_frame_obj = frame # Keep for integrity check
-            now = time.time()
-            frame_timestamps.append(now)
-            frame_numbers.append(frame.frame_number)
-            frame_sizes.append(len(frame.data))
+            prev_frame_num = last_frame_number
+            if last_sample_time is not None:
+                interval_stats.update(now - last_sample_time)
+                dropped_frames += max(0, frame.frame_number - prev_frame_num - 1)
+            size_stats.update(sum(frame.plane_size[:frame.plane_cnt]))
+            last_sample_time = now
+            total_frames += 1
             last_frame_number = frame.frame_number
 
             # Camera switching detection
             if test_switching:
-                camera_ids.append(frame.camera_id)
+                camera_frame_counts[frame.camera_id] = camera_frame_counts.get(frame.camera_id, 0) + 1
                 if last_camera_id is not None and frame.camera_id != last_camera_id:
                     # Camera switch detected!
                     # Calculate frame gap (should be 1 for smooth transition)
-                    prev_frame_num = frame_numbers[-2] if len(frame_numbers) >= 2 else 0
                     gap = frame.frame_number - prev_frame_num - 1 if prev_frame_num > 0 else 0
                     switch_event = {
                         "time_offset_sec": round(now - start_time, 3),
@@ -177,86 +435,77 @@ async def profile_shm(shm_name: str, duration: float, monitor_url: Optional[str]
                     switch_events.append(switch_event)
                 last_camera_id = frame.camera_id
 
-            # Record metadata
+            # Record metadata and resolve per-frame handlers once
             if resolution == "unknown":
                 resolution = f"{frame.width}x{frame.height}"
-                format_map = {0: "JPEG", 1: "NV12", 2: "RGB", 3: "H.264"}
-                frame_format = format_map.get(frame.format, f"unknown({frame.format})")
-            
-            # Simple content check for NV12/RGB/JPEG
-            if frame.format in (0, 1, 2) and len(frame.data) > 0:
-                if frame.format == 1: # NV12: Y-plane is the first width*height bytes
-                    y_plane = np.frombuffer(frame.data[:frame.width * frame.height], dtype=np.uint8)
-                    luma_samples.append(float(np.mean(y_plane)))
-
-                    # Save I-frame as JPEG if enabled
-                    if save_iframes and output_dir:
+                sample_luma = make_luma_sampler(frame.width, frame.height)
+                save_nv12 = iframe_saver is not None and output_dir is not None
+
+            # Content check at most once per luma_interval
+            check_luma = now >= next_luma_time
+
+            # Import the VIO buffer only for frames whose pixels are inspected
+            if frame.plane_cnt == 2 and (check_luma or save_nv12):
+                try:
+                    y_arr, uv_arr, hb_mem_buffer = import_nv12_graph_buf(
+                        frame.hb_mem_buf_data, frame.plane_size
+                    )
+                except Exception:
+                    import_errors += 1
+                    continue
+                try:
+                    if check_luma and sample_luma is not None:
                         try:
-                            bgr = nv12_to_bgr(frame.data, frame.width, frame.height)
-                            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
-                            filename = f"iframe_{timestamp}_frame{frame.frame_number:06d}.jpg"
-                            filepath = output_dir / filename
-                            cv2.imwrite(str(filepath), bgr, [cv2.IMWRITE_JPEG_QUALITY, 95])
-                            saved_iframe_count += 1
-                        except Exception:
-                            pass  # Silently ignore save errors
-
-                elif frame.format == 2: # RGB
-                    rgb_data = np.frombuffer(frame.data, dtype=np.uint8).reshape((frame.height, frame.width, 3))
-                    luma = 0.299 * rgb_data[:,:,0] + 0.587 * rgb_data[:,:,1] + 0.114 * rgb_data[:,:,2]
-                    luma_samples.append(float(np.mean(luma)))
-
-        await asyncio.sleep(0.005)  # 5ms poll interval
-
-    # Integrity Checks (Before closing)
-    write_index = shm.get_write_index()
-    write_index_delta = write_index - initial_write_index
-    actual_write_fps = write_index_delta / duration if duration > 0 else 0
-
-    shm.close()
+                            luma_stats.update(sample_luma(hb_mem_buffer))
+                        except (ValueError, RuntimeError):
+                            unsampled_frames += 1  # Malformed plane; keep profiling
+                        next_luma_time = now + luma_interval
+
+                    if save_nv12:
+                        filename = f"iframe_{save_base}_{iframe_saver.submitted:06d}_frame{frame.frame_number:06d}.jpg"
+                        iframe_saver.submit(y_arr, uv_arr, frame.plane_size[0],
+                                            frame.width, frame.height, output_dir / filename)
+                finally:
+                    hb_mem_buffer.release()
+
+    # Drain pending I-frame writes before reporting
+    if iframe_saver:
+        saved_iframe_count = iframe_saver.close()
 
-    # Get monitor result if available
-    monitor_result = None
-    if monitor_task:
-        monitor_result = await monitor_task
-
-    if not frame_timestamps:
-        # Check if we at least opened it and saw a write_index
-        is_stale = False
-        if write_index > 0:
-             # Even if no NEW frames, check if existing data is stale
-             # (This part is tricky without a frame object, but we can assume NO_DATA if no frames arrived)
-             pass
+    # Integrity Checks
+    final_frame = shm.get_frame()
+    frame_number = final_frame.frame_number if final_frame else 0
+    frame_number_delta = frame_number - initial_frame_number
+    actual_write_fps = frame_number_delta / duration if duration > 0 else 0
 
+    if total_frames == 0:
         return {
             "status": "NO_DATA",
             "target_shm": shm_name,
             "sampling_duration_sec": duration,
-            "monitor_check": monitor_result,
+            "monitor_check": None,  # Filled in by _sample
             "integrity": {
-                "write_index": write_index,
-                "status": "OK" if write_index > 0 else "EMPTY"
+                "frame_number": frame_number,
+                "status": "OK" if final_frame is not None else "EMPTY"
             },
             "error": "No frames received during sampling period."
         }
 
     # Calculate statistics
-    total_frames = len(frame_timestamps)
-
-    avg_luma = statistics.mean(luma_samples) if luma_samples else None
+    avg_luma = luma_stats.mean if luma_stats.n else None
     is_black_screen = avg_luma is not None and avg_luma < 10.0 # Threshold for "black"
 
     # Integrity Checks
     integrity_status = "OK"
-    if write_index > 1_000_000_000: # Arbitrary large number check for corruption
+    if frame_number > 1_000_000_000: # Arbitrary large number check for corruption
         integrity_status = "POSSIBLE_CORRUPTION"
 
     is_stale = False
     time_since_last_update = None
-    if last_frame_obj and frame_timestamps:
+    if last_frame_obj and total_frames:
         # Check staleness based on last sample time, not frame timestamp
         # (frame timestamp may use CLOCK_MONOTONIC instead of CLOCK_REALTIME)
-        time_since_last_update = time.time() - frame_timestamps[-1]
+        time_since_last_update = time.monotonic() - last_sample_time
         if time_since_last_update > 5.0:
             is_stale = True
             integrity_status = "STALE_DATA"
@@ -284,22 +533,27 @@ async def profile_shm(shm_name: str, duration: float, monitor_url: Optional[str]
          else:
              status = "NO_FRAMES"
 
-    result = {
+    result: Dict[str, Any] = {
         "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
         "target_shm": shm_name,
         "sampling_duration_sec": duration,
         "stats": {
             "total_frames": total_frames,
-            "actual_write_fps": round(actual_write_fps, 2),  # FPS based on write_index delta
-            "write_index": write_index,
-            "write_index_delta": write_index_delta
+            "actual_write_fps": round(actual_write_fps, 2),  # FPS based on frame_number delta
+            "frame_number": frame_number,
+            "frame_number_delta": frame_number_delta,
+            "avg_frame_interval_ms": round(interval_stats.mean * 1000, 2),
+            "frame_interval_stdev_ms": round(interval_stats.stdev * 1000, 2),
+            "dropped_frames": dropped_frames
         },
         "content_check": {
-            "format": frame_format,
+            "format": "NV12",
             "resolution": resolution,
-            "avg_frame_size_bytes": int(statistics.mean(frame_sizes)) if frame_sizes else 0,
+            "avg_frame_size_bytes": int(size_stats.mean),
             "avg_luma": round(avg_luma, 2) if avg_luma is not None else "N/A",
-            "is_black_screen": is_black_screen
+            "is_black_screen": is_black_screen,
+            "import_errors": import_errors,
+            "unsampled_frames": unsampled_frames
         },
         "integrity": {
             "status": integrity_status,
@@ -309,11 +563,18 @@ async def profile_shm(shm_name: str, duration: float, monitor_url: Optional[str]
         "status": status
     }
 
+    if iframe_saver:
+        # skipped_frames: due for saving while IFRAME_MAX_PENDING saves were in flight
+        result["iframe_saves"] = {
+            "saved_frames": saved_iframe_count,
+            "skipped_frames": iframe_saver.skipped
+        }
+
     # Add camera switching info if test mode enabled
     if test_switching:
-        if camera_ids:
-            camera_0_frames = camera_ids.count(0)
-            camera_1_frames = camera_ids.count(1)
+        if total_frames:
+            camera_0_frames = camera_frame_counts.get(0, 0)
+            camera_1_frames = camera_frame_counts.get(1, 0)
             result["camera_switching"] = {
                 "enabled": True,
                 "switches_detected": len(switch_events),
@@ -321,13 +582,13 @@ async def profile_shm(shm_name: str, duration: float, monitor_url: Optional[str]
                 "camera_0_frames": camera_0_frames,
                 "camera_1_frames": camera_1_frames,
                 "camera_distribution": {
-                    "camera_0_percent": round(camera_0_frames / len(camera_ids) * 100, 1) if camera_ids else 0,
-                    "camera_1_percent": round(camera_1_frames / len(camera_ids) * 100, 1) if camera_ids else 0
+                    "camera_0_percent": round(camera_0_frames / total_frames * 100, 1),
+                    "camera_1_percent": round(camera_1_frames / total_frames * 100, 1)
                 }
             }
             # Update status if switching is problematic
             if len(switch_events) > 0:
-                max_gap = max([e["frame_gap"] for e in switch_events])
+                max_gap = int(np.max([e["frame_gap"] for e in switch_events]))
                 if max_gap > 5:  # More than 5 frames dropped during switch
                     if status == "HEALTHY":
                         status = "WARNING"
@@ -339,11 +600,6 @@ async def profile_shm(shm_name: str, duration: float, monitor_url: Optional[str]
                 "switches_detected": 0,
                 "note": "No frames received during test"
             }
-    
-    if monitor_result:
-        result["monitor_check"] = monitor_result
-        if not monitor_result.get("available"):
-            result["status"] = "PARTIAL_OUTAGE" if result["status"] == "HEALTHY" else result["status"]
 
     return result
 
@@ -373,9 +629,23 @@ async def profile_with_forced_switching(shm_name: str, phase_duration: float = 5
 
     print(f"[ForcedSwitchingTest] Found camera_switcher_daemon PID: {switcher_pid}", file=sys.stderr)
 
+    # One mapping for all three phases instead of shm_open/mmap per phase
+    shm = open_shm(shm_name)
+    if isinstance(shm, dict):
+        return shm
+    try:
+        return await _forced_switching_phases(shm, shm_name, phase_duration, switcher_pid)
+    finally:
+        shm.close()
+
+
+async def _forced_switching_phases(shm: ZeroCopySharedMemory, shm_name: str,
+                                   phase_duration: float, switcher_pid: int) -> Dict:
+    """Run the three profiling phases of the forced switching test on one SHM."""
+
     # Phase 1: Initial state
     print(f"\n[Phase 1] Profiling initial state ({phase_duration}s)...", file=sys.stderr)
-    phase1_result = await profile_shm(shm_name, phase_duration, test_switching=True)
+    phase1_result = await _sample(shm, shm_name, phase_duration, test_switching=True)
 
     if phase1_result.get("status") == "ERROR":
         return phase1_result
@@ -402,7 +672,7 @@ async def profile_with_forced_switching(shm_name: str, phase_duration: float = 5
         }
 
     print(f"[Phase 2] Profiling switched state ({phase_duration}s)...", file=sys.stderr)
-    phase2_result = await profile_shm(shm_name, phase_duration, test_switching=True)
+    phase2_result = await _sample(shm, shm_name, phase_duration, test_switching=True)
 
     if phase2_result.get("status") == "ERROR":
         return phase2_result
@@ -422,7 +692,7 @@ async def profile_with_forced_switching(shm_name: str, phase_duration: float = 5
         }
 
     print(f"[Phase 3] Profiling reversed state ({phase_duration}s)...", file=sys.stderr)
-    phase3_result = await profile_shm(shm_name, phase_duration, test_switching=True)
+    phase3_result = await _sample(shm, shm_name, phase_duration, test_switching=True)
 
     if phase3_result.get("status") == "ERROR":
         return phase3_result
@@ -34,6 +34,7 @@ from typing import Any, Optional
 import numpy as np
 import logging
 import struct
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +51,17 @@ def _get_array_type(size: int) -> type:
     return t
 
 
+def _vaddr_to_ndarray(vaddr: int, size: int) -> np.ndarray:
+    """
+    Zero-copy uint8 view of size bytes at a mapped virtual address.
+
+    np.frombuffer on the ctypes array skips np.ctypeslib.as_array's
+    __array_interface__ round-trip. The view does not keep the mapping
+    alive: it is only valid until the owning buffer is released.
+    """
+    return np.frombuffer(_get_array_type(size).from_address(vaddr), dtype=np.uint8)
+
+
 # ============================================================================
 # D-Robotics SDK Structures (from hb_mem_mgr.h)
 # ============================================================================
@@ -148,10 +160,21 @@ def _load_libhbmem() -> Optional[ctypes.CDLL]:
     return None
 
 
+# Bound foreign functions for the per-frame calls, set once the library is
+# loaded. Calling these directly skips the CDLL attribute lookup, and their
+# argtypes convert plain Python ints (no c_uint64()/c_int32() wrapping).
+_hb_invalidate: Optional[Any] = None        # hb_mem_invalidate_buf_with_vaddr
+_hb_free_buf: Optional[Any] = None          # hb_mem_free_buf
+_hb_import_com_buf: Optional[Any] = None    # hb_mem_import_com_buf
+_hb_import_graph_buf: Optional[Any] = None  # hb_mem_import_graph_buf
+
+
 def _setup_function_signatures(lib: ctypes.CDLL) -> None:
     """
     Set up ctypes function signatures for the hb_mem API.
     """
+    global _hb_invalidate, _hb_free_buf, _hb_import_com_buf, _hb_import_graph_buf
+
     # int hb_mem_module_open(void)
     lib.hb_mem_module_open.argtypes = []
     lib.hb_mem_module_open.restype = c_int
@@ -179,6 +202,11 @@ def _setup_function_signatures(lib: ctypes.CDLL) -> None:
     lib.hb_mem_invalidate_buf_with_vaddr.argtypes = [c_uint64, c_uint64]
     lib.hb_mem_invalidate_buf_with_vaddr.restype = c_int
 
+    _hb_invalidate = lib.hb_mem_invalidate_buf_with_vaddr
+    _hb_free_buf = lib.hb_mem_free_buf
+    _hb_import_com_buf = lib.hb_mem_import_com_buf
+    _hb_import_graph_buf = lib.hb_mem_import_graph_buf
+
 
 # ============================================================================
 # Module Initialization
@@ -239,6 +267,29 @@ def close_module() -> None:
 # HbMemBuffer Class
 # ============================================================================
 
+# Per-thread input descriptor for hb_mem_import_com_buf. Only share_id (and
+# size/phys_addr for the contiguous fallback) is read by the SDK, so one
+# zeroed struct per thread replaces an allocation per import.
+_com_scratch = threading.local()
+
+
+def _get_com_in_scratch() -> hb_mem_common_buf_t:
+    buf = getattr(_com_scratch, "in_buf", None)
+    if buf is None:
+        buf = hb_mem_common_buf_t()
+        _com_scratch.in_buf = buf
+    else:
+        ctypes.memset(ctypes.addressof(buf), 0, ctypes.sizeof(buf))
+    return buf
+
+
+
+# HbMemBuffer cache maintenance modes for reads through as_numpy()/np.asarray()
+CACHE_MODE_EACH_READ = "invalidate_each_read"  # Invalidate on every read (default)
+CACHE_MODE_ONCE = "once"                       # Invalidate on first read after import only
+CACHE_MODE_BYPASS = "bypass"                   # Never invalidate (caller guarantees no stale lines)
+_CACHE_MODES = (CACHE_MODE_EACH_READ, CACHE_MODE_ONCE, CACHE_MODE_BYPASS)
+
 
 class HbMemBuffer:
     """
@@ -247,36 +298,54 @@ class HbMemBuffer:
     Provides zero-copy access to VIO buffers shared via share_id.
     """
 
-    def __init__(self, share_id: int, expected_size: int):
+    def __init__(self, share_id: int, expected_size: int, cache_mode: str = CACHE_MODE_EACH_READ):
         """
         Import a buffer using share_id.
 
         Args:
             share_id: The share_id from ZeroCopyFrame
             expected_size: Expected buffer size in bytes
+            cache_mode: When reads invalidate the CPU cache (CACHE_MODE_*).
+                The default invalidates on every read, so a recycled VIO
+                buffer never serves stale cache lines. CACHE_MODE_ONCE is
+                for callers that know the frame is not rewritten while held.
+                CACHE_MODE_BYPASS is only safe if this process never read or
+                wrote the buffer through the cache before the producer's DMA,
+                e.g. when the data is only handed on to another DMA engine.
 
         Raises:
             RuntimeError: If import fails
+            ValueError: If cache_mode is unknown
         """
-        self._in_buf = hb_mem_common_buf_t()  # Input buffer with share_id
-        self._buf = hb_mem_common_buf_t()     # Output buffer (actual imported data)
+        self._buf = hb_mem_common_buf_t()  # Output buffer (actual imported data)
         self._imported = False
+        if cache_mode not in _CACHE_MODES:
+            raise ValueError(f"Unknown cache_mode {cache_mode!r} (expected one of {_CACHE_MODES})")
+        self._cache_mode = cache_mode
+        self._invalidated = False  # Cache invalidated since import
+        # Byte ranges invalidated since import, for windowed CACHE_MODE_ONCE reads
+        self._invalidated_ranges: list[tuple[int, int]] = []
+        self._np: Optional[np.ndarray] = None  # Cached uint8 view of the mapping
         self._share_id = share_id
         self._expected_size = expected_size
 
-        lib = _load_libhbmem()
-        if lib is None:
-            raise RuntimeError("hb_mem library not available")
-
+        # init_module() succeeding implies the library and bound functions
+        # are loaded, so the per-frame path checks a single flag
         if not _module_initialized:
+            if _load_libhbmem() is None:
+                raise RuntimeError("hb_mem library not available")
             raise RuntimeError(
                 "hb_mem module not initialized - call init_module() first"
             )
 
         # Set up input buffer with share_id
-        self._in_buf.share_id = c_int32(share_id)
+        in_buf = _get_com_in_scratch()
+        in_buf.share_id = share_id
 
-        ret = lib.hb_mem_import_com_buf(byref(self._in_buf), byref(self._buf))
+        import_com_buf = _hb_import_com_buf
+        if import_com_buf is None:
+            raise RuntimeError("hb_mem library not available")
+        ret = import_com_buf(byref(in_buf), byref(self._buf))
         if ret != 0:
             raise RuntimeError(
                 f"hb_mem_import_com_buf failed: {ret} (share_id={share_id})"
@@ -284,22 +353,37 @@ class HbMemBuffer:
 
         self._imported = True
         logger.debug(
-            f"Imported buffer: share_id={share_id}, size={self._buf.size}, vaddr=0x{self._buf.virt_addr:x}"
+            "Imported buffer: share_id=%d, size=%d, vaddr=0x%x",
+            share_id, self._buf.size, self._buf.virt_addr,
         )
 
     @classmethod
-    def import_from_share_id(cls, share_id: int, expected_size: int) -> "HbMemBuffer":
+    def import_from_share_id(
+        cls, share_id: int, expected_size: int, cache_mode: str = CACHE_MODE_EACH_READ
+    ) -> "HbMemBuffer":
         """
         Factory method to import buffer from share_id.
 
         Args:
             share_id: The share_id from ZeroCopyFrame
             expected_size: Expected buffer size in bytes
+            cache_mode: Cache maintenance mode (see __init__)
 
         Returns:
             HbMemBuffer instance
         """
-        return cls(share_id, expected_size)
+        return cls(share_id, expected_size, cache_mode)
+
+    def _needs_invalidate(self, offset: int = 0, end: Optional[int] = None) -> bool:
+        mode = self._cache_mode
+        if mode == CACHE_MODE_ONCE:
+            if self._invalidated:
+                return False
+            if end is None:
+                end = int(self._buf.size)
+            # A window is done once a single invalidated range covers it
+            return not any(lo <= offset and end <= hi for lo, hi in self._invalidated_ranges)
+        return mode == CACHE_MODE_EACH_READ
 
     def invalidate_cache(self) -> None:
         """
@@ -307,18 +391,64 @@ class HbMemBuffer:
 
         Call this before reading the buffer to ensure fresh data from DMA.
         """
-        lib = _load_libhbmem()
-        if lib is None or not self._imported:
+        if _hb_invalidate is None or not self._imported:
+            return
+
+        _hb_invalidate(self._buf.virt_addr, self._buf.size)
+        self._invalidated = True
+
+    def invalidate_range(self, offset: int, length: int) -> None:
+        """
+        Invalidate CPU cache for part of this buffer only.
+
+        The range is widened to whole cache lines (within the mapping), so
+        a window that starts or ends mid-line is still fully refreshed.
+
+        Args:
+            offset: Byte offset from the start of the buffer
+            length: Number of bytes
+        """
+        if _hb_invalidate is None or not self._imported or length <= 0:
             return
+        size = int(self._buf.size)
+        if offset < 0 or offset + length > size:
+            raise ValueError(
+                f"Range [{offset}, {offset + length}) outside buffer of {size} bytes"
+            )
 
-        lib.hb_mem_invalidate_buf_with_vaddr(self._buf.virt_addr, self._buf.size)
+        base = int(self._buf.virt_addr)
+        vaddr, aligned_size = _align_to_cache_lines(base + offset, length, base, base + size)
+        _hb_invalidate(vaddr, aligned_size)
+        self._mark_invalidated(vaddr - base, vaddr - base + aligned_size)
+
+    def _mark_invalidated(self, lo: int, hi: int) -> None:
+        """Record [lo, hi) as invalidated, merging overlapping or adjacent ranges."""
+        ranges = []
+        for r_lo, r_hi in self._invalidated_ranges:
+            if r_hi < lo or hi < r_lo:
+                ranges.append((r_lo, r_hi))
+            else:
+                lo, hi = min(lo, r_lo), max(hi, r_hi)
+        ranges.append((lo, hi))
+        self._invalidated_ranges = ranges
+        if lo == 0 and hi >= int(self._buf.size):
+            self._invalidated = True
 
-    def as_numpy(self, dtype: "np.dtype[Any]" = np.uint8) -> np.ndarray:  # type: ignore[assignment]
+    def as_numpy(
+        self,
+        dtype: "np.dtype[Any]" = np.uint8,  # type: ignore[assignment]
+        offset: int = 0,
+        length: Optional[int] = None,
+    ) -> np.ndarray:
         """
         Get buffer as numpy array (zero-copy view).
 
         Args:
             dtype: Numpy dtype for the array (default: uint8)
+            offset: Byte offset of the window to return (default: 0)
+            length: Window size in bytes (default: to the end). When a window
+                is requested, only that range is invalidated (with
+                CACHE_MODE_ONCE, only if no earlier read covered it).
 
         Returns:
             Numpy array view of the buffer
@@ -330,21 +460,63 @@ class HbMemBuffer:
         if not self._imported:
             raise RuntimeError("Buffer not imported or already released")
 
-        # Invalidate cache to get fresh data
-        self.invalidate_cache()
-
-        # Create numpy array from virtual address
-        # Using ctypes to create a buffer from the virtual address
         size = int(self._buf.size)
-        vaddr = int(self._buf.virt_addr)
+        end = size if length is None else offset + length
+        partial = offset != 0 or end != size
+        if partial and (offset < 0 or offset > end or end > size):
+            raise ValueError(f"Range [{offset}, {end}) outside buffer of {size} bytes")
+
+        # Invalidate cache to get fresh data (per cache_mode; by default on
+        # every read)
+        if self._needs_invalidate(offset, end):
+            if partial:
+                self.invalidate_range(offset, end - offset)
+            else:
+                self.invalidate_cache()
+
+        # The mapping is fixed for the life of the import: build the view once
+        arr = self._np
+        if arr is None:
+            arr = _vaddr_to_ndarray(int(self._buf.virt_addr), size)
+            self._np = arr
+        if partial:
+            arr = arr[offset:end]
+
+        if np.dtype(dtype) != np.uint8:
+            return arr.view(dtype)
+        return arr
+
+    @property
+    def __array_interface__(self) -> dict[str, Any]:
+        """
+        NumPy array interface: np.asarray(buf) is a zero-copy uint8 view.
 
-        # Create ctypes array type and instance from address
-        arr = _get_array_type(size).from_address(vaddr)
+        The resulting array keeps this HbMemBuffer alive, but it is still
+        invalid after release().
+        """
+        if not self._imported:
+            raise RuntimeError("Buffer not imported or already released")
+        if self._needs_invalidate():
+            self.invalidate_cache()
+        return {
+            "shape": (int(self._buf.size),),
+            "typestr": "|u1",
+            "data": (int(self._buf.virt_addr), False),
+            "version": 3,
+        }
+
+    def view(self, dtype: "np.dtype[Any]", shape: tuple[int, ...]) -> np.ndarray:  # type: ignore[assignment]
+        """
+        Reinterpret the buffer with a dtype and shape (zero-copy).
 
-        # Create numpy array as view (no copy)
-        np_arr = np.ctypeslib.as_array(arr)
+        Args:
+            dtype: Numpy dtype for the view
+            shape: Shape of the view (must match size / itemsize)
 
-        return np_arr
+        Returns:
+            Numpy array view of the buffer
+        """
+        return self.as_numpy().view(dtype).reshape(shape)
 
     @property
     def virt_addr(self) -> int:
@@ -376,14 +548,14 @@ class HbMemBuffer:
         if not self._imported:
             return
 
-        lib = _load_libhbmem()
-        if lib is not None:
-            ret = lib.hb_mem_free_buf(c_int32(self._buf.fd))
+        if _hb_free_buf is not None:
+            ret = _hb_free_buf(self._buf.fd)
             if ret != 0:
                 logger.warning(f"hb_mem_free_buf failed: {ret}")
 
         self._imported = False
-        logger.debug(f"Released buffer: share_id={self._share_id}")
+        self._np = None
+        logger.debug("Released buffer: share_id=%d", self._share_id)
 
     def __del__(self):
         """Destructor - ensure buffer is released."""
@@ -438,6 +610,49 @@ _GRAPH_BUF_LAYOUT = {
     "phys_addr": 112,   # uint64_t[3]
 }
 
+# Offsets used per import, bound as plain ints (no dict lookup in the hot path)
+_OFF_FD = _GRAPH_BUF_LAYOUT["fd"]
+_OFF_VIRT_ADDR = _GRAPH_BUF_LAYOUT["virt_addr"]
+_OFF_PHYS_ADDR = _GRAPH_BUF_LAYOUT["phys_addr"]
+
+# Whole descriptor in one precompiled unpack ("4x" is the padding before flags).
+# Flat tuple order: fd[0:3], plane_cnt[3], format[4], width[5], height[6],
+# stride[7], vstride[8], is_contig[9], share_id[10:13], flags[13], size[14:17],
+# virt_addr[17:20], phys_addr[20:23], offset[23:26]
+_GRAPH_BUF_STRUCT = struct.Struct("<3i7i3i4xq3Q3Q3Q3Q")
+
+
+# D-cache line size of the X5's Cortex-A55 cores. Cache maintenance works on
+# whole lines, so ranges are widened to line boundaries before invalidating.
+_CACHE_LINE = 64
+
+
+def _align_to_cache_lines(vaddr: int, size: int, lo: int, hi: int) -> tuple[int, int]:
+    """
+    Widen [vaddr, vaddr+size) to cache-line boundaries, clamped to [lo, hi).
+
+    Returns:
+        (aligned_vaddr, aligned_size)
+    """
+    start = max(vaddr & ~(_CACHE_LINE - 1), lo)
+    end = min((vaddr + size + _CACHE_LINE - 1) & ~(_CACHE_LINE - 1), hi)
+    return start, end - start
+
+
+# Per-thread (in, out) descriptor scratch for hb_mem_import_graph_buf. The
+# SDK only reads/writes them during the call and the output is unpacked right
+# away, so they are reused across imports instead of allocated per frame.
+_graph_scratch = threading.local()
+
+
+def _get_graph_scratch() -> tuple[ctypes.Array, ctypes.Array]:  # type: ignore[type-arg]
+    bufs = getattr(_graph_scratch, "bufs", None)
+    if bufs is None:
+        buf_type = _get_array_type(HbMemGraphicBuffer.HB_MEM_GRAPHIC_BUF_SIZE)
+        bufs = (buf_type(), buf_type())
+        _graph_scratch.bufs = bufs
+    return bufs
+
 
 class HbMemGraphicBuffer:
     """
@@ -466,9 +681,16 @@ class HbMemGraphicBuffer:
         # Set _imported early so __del__ doesn't raise AttributeError on failure
         self._imported = False
         self._fd = [0, 0, 0]
+        self._fds_to_free: tuple[int, ...] = ()  # Unique valid fds, set at import
         self._virt_addr = [0, 0, 0]
         self._size = [0, 0, 0]
+        self._phys_addr = [0, 0, 0]
         self._plane_cnt = 0
+        self._width = 0
+        self._height = 0
+        self._stride = 0
+        self._contig_size = 0  # Total Y+UV span when planes are back-to-back
+        self._invalidated = [False, False, False]  # Per plane, since import
         self._com_buf = None  # Holds hb_mem_common_buf_t for contiguous fallback
 
         if len(raw_buf_data) != self.HB_MEM_GRAPHIC_BUF_SIZE:
@@ -476,39 +698,41 @@ class HbMemGraphicBuffer:
                 f"Expected {self.HB_MEM_GRAPHIC_BUF_SIZE} bytes, got {len(raw_buf_data)}"
             )
 
-        lib = _load_libhbmem()
-        if lib is None:
-            raise RuntimeError("hb_mem library not available")
-
+        # init_module() succeeding implies the library and bound functions
+        # are loaded, so the per-frame path checks a single flag
         if not _module_initialized:
+            if _load_libhbmem() is None:
+                raise RuntimeError("hb_mem library not available")
             raise RuntimeError(
                 "hb_mem module not initialized - call init_module() first"
             )
 
-        L = _GRAPH_BUF_LAYOUT
-
-        # Extract key fields from raw buffer for import logic
-        share_ids = list(struct.unpack_from("<3i", raw_buf_data, L["share_id"]))
-        plane_cnt_in = struct.unpack_from("<i", raw_buf_data, L["plane_cnt"])[0]
-        sizes = list(struct.unpack_from("<3Q", raw_buf_data, L["size"]))
-        phys_addrs = list(struct.unpack_from("<3Q", raw_buf_data, L["phys_addr"]))
+        # Extract key fields from raw buffer for import logic (single unpack)
+        fields = _GRAPH_BUF_STRUCT.unpack(raw_buf_data)
+        plane_cnt_in = fields[3]
+        # Geometry is producer metadata; the com_buf fallback keeps these values
+        self._width = fields[5]
+        self._height = fields[6]
+        self._stride = fields[7]
+        share_ids = list(fields[10:13])
+        sizes = list(fields[14:17])
+        phys_addrs = list(fields[20:23])
 
         is_contiguous = (plane_cnt_in >= 2 and share_ids[1] == 0)
 
         # Always try hb_mem_import_graph_buf first (recommended by SDK sample_share.c)
         # Falls back to hb_mem_import_com_buf for contiguous buffers if graph_buf fails
         try:
-            self._import_graph_buf(lib, raw_buf_data, share_ids, plane_cnt_in)
+            self._import_graph_buf(raw_buf_data, share_ids, plane_cnt_in)
         except RuntimeError as e:
             if is_contiguous:
                 logger.warning(f"graph_buf import failed ({e}), falling back to com_buf")
-                self._import_contiguous(lib, share_ids[0], sizes, phys_addrs, plane_cnt_in)
+                self._import_contiguous(share_ids[0], sizes, phys_addrs, plane_cnt_in)
             else:
                 raise
 
     def _import_contiguous(
         self,
-        lib: ctypes.CDLL,
         share_id: int,
         sizes: list[int],
         phys_addrs: list[int],
@@ -518,14 +742,17 @@ class HbMemGraphicBuffer:
         total_size = sum(sizes[:plane_cnt])
 
         # Build input common buffer (corrected layout: fd@0, share_id@4, flags@8, size@16, ...)
-        in_buf = hb_mem_common_buf_t()
-        in_buf.share_id = c_int32(share_id)
-        in_buf.size = c_uint64(total_size)
-        in_buf.phys_addr = c_uint64(phys_addrs[0])
+        in_buf = _get_com_in_scratch()
+        in_buf.share_id = share_id
+        in_buf.size = total_size
+        in_buf.phys_addr = phys_addrs[0]
 
         out_buf = hb_mem_common_buf_t()
 
-        ret = lib.hb_mem_import_com_buf(byref(in_buf), byref(out_buf))
+        import_com_buf = _hb_import_com_buf
+        if import_com_buf is None:
+            raise RuntimeError("hb_mem library not available")
+        ret = import_com_buf(byref(in_buf), byref(out_buf))
         if ret != 0:
             raise RuntimeError(
                 f"hb_mem_import_com_buf failed: {ret} "
@@ -538,43 +765,47 @@ class HbMemGraphicBuffer:
 
         # Single fd for the contiguous buffer
         self._fd = [out_buf.fd, 0, 0]
+        self._fds_to_free = (out_buf.fd,) if out_buf.fd > 0 else ()
 
         # Y plane starts at virt_addr, UV plane at virt_addr + size[0]
         base_vaddr = out_buf.virt_addr
         self._virt_addr = [base_vaddr, base_vaddr + sizes[0], 0]
-        self._size = list(sizes[:3]) if len(sizes) >= 3 else sizes + [0] * (3 - len(sizes))
+        self._size = sizes  # Fresh 3-entry list from the descriptor unpack
+        self._set_contig_size(one_mapping=True)
 
         logger.debug(
-            f"Imported contiguous NV12 via com_buf: share_id={share_id}, fd={out_buf.fd}, "
-            f"vaddr=0x{base_vaddr:x}, total_size={total_size}, "
-            f"Y={sizes[0]}, UV={sizes[1]}"
+            "Imported contiguous NV12 via com_buf: share_id=%d, fd=%d, "
+            "vaddr=0x%x, total_size=%d, Y=%d, UV=%d",
+            share_id, out_buf.fd, base_vaddr, total_size, sizes[0], sizes[1],
         )
 
     def _import_graph_buf(
         self,
-        lib: ctypes.CDLL,
         raw_buf_data: bytes,
         share_ids: list[int],
         plane_cnt: int,
     ) -> None:
         """Import multi-buffer graphic buffer via hb_mem_import_graph_buf."""
-        L = _GRAPH_BUF_LAYOUT
+        buf_size = self.HB_MEM_GRAPHIC_BUF_SIZE
+        in_buf, out_buf = _get_graph_scratch()
 
-        # Create mutable input buffer from raw bytes
-        in_buf = _get_array_type(self.HB_MEM_GRAPHIC_BUF_SIZE)(*raw_buf_data)
+        # Copy raw bytes into the reused input buffer (one memcpy, no per-byte splat)
+        in_addr = ctypes.addressof(in_buf)
+        ctypes.memmove(in_addr, raw_buf_data, buf_size)
 
         # Clear process-local fields invalid in consumer process
-        struct.pack_into("<3i", in_buf, L["fd"], 0, 0, 0)
-        struct.pack_into("<3Q", in_buf, L["virt_addr"], 0, 0, 0)
+        ctypes.memset(in_addr + _OFF_FD, 0, 3 * 4)
+        ctypes.memset(in_addr + _OFF_VIRT_ADDR, 0, 3 * 8)
 
-        self._out_buf = _get_array_type(self.HB_MEM_GRAPHIC_BUF_SIZE)()
+        out_addr = ctypes.addressof(out_buf)
+        ctypes.memset(out_addr, 0, buf_size)
 
-        ret = lib.hb_mem_import_graph_buf(
-            ctypes.addressof(in_buf),
-            ctypes.addressof(self._out_buf),
-        )
+        import_graph_buf = _hb_import_graph_buf
+        if import_graph_buf is None:
+            raise RuntimeError("hb_mem library not available")
+        ret = import_graph_buf(in_addr, out_addr)
         if ret != 0:
-            phys_info = list(struct.unpack_from("<3Q", raw_buf_data, L["phys_addr"]))
+            phys_info = list(struct.unpack_from("<3Q", raw_buf_data, _OFF_PHYS_ADDR))
             raise RuntimeError(
                 f"hb_mem_import_graph_buf failed: {ret} "
                 f"(share_id={share_ids[:plane_cnt]}, plane_cnt={plane_cnt}, "
@@ -583,24 +814,51 @@ class HbMemGraphicBuffer:
 
         self._imported = True
 
-        # Extract fields from output buffer using verified layout
-        out_bytes = bytes(self._out_buf)
-
-        self._fd = list(struct.unpack_from("<3i", out_bytes, L["fd"]))
-        self._virt_addr = list(struct.unpack_from("<3Q", out_bytes, L["virt_addr"]))
-        self._phys_addr = list(struct.unpack_from("<3Q", out_bytes, L["phys_addr"]))
-        self._size = list(struct.unpack_from("<3Q", out_bytes, L["size"]))
-        self._plane_cnt = struct.unpack_from("<i", out_bytes, L["plane_cnt"])[0]
+        # Extract fields from output buffer using verified layout (single unpack)
+        # Unpack straight from the ctypes buffer (buffer protocol, no bytes copy)
+        out = _GRAPH_BUF_STRUCT.unpack_from(out_buf)
+
+        self._fd = list(out[0:3])
+        self._plane_cnt = out[3]
+        # Planes of one allocation share an fd: dedup once here, not per release
+        self._fds_to_free = tuple(dict.fromkeys(
+            fd for fd in out[0:self._plane_cnt] if fd > 0
+        ))
+        self._width = out[5]
+        self._height = out[6]
+        self._stride = out[7]
+        self._size = list(out[14:17])
+        self._virt_addr = list(out[17:20])
+        self._phys_addr = list(out[20:23])
 
         # For contiguous buffers (share_id[1]==0), compute UV virt_addr from Y offset
         if self._plane_cnt >= 2 and self._virt_addr[1] == 0 and self._virt_addr[0] != 0:
             self._virt_addr[1] = self._virt_addr[0] + self._size[0]
+            one_mapping = True
+        else:
+            # Planes imported separately may land back-to-back in virtual
+            # memory yet be distinct allocations; one fd means one mapping
+            one_mapping = len(set(self._fd[:self._plane_cnt])) == 1
+        self._set_contig_size(one_mapping)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Imported graph_buf: fd={self._fd[:self._plane_cnt]}, "
+                f"vaddr=[0x{self._virt_addr[0]:x}, 0x{self._virt_addr[1]:x}], "
+                f"size={self._size[:self._plane_cnt]}, planes={self._plane_cnt}"
+            )
 
-        logger.debug(
-            f"Imported graph_buf: fd={self._fd[:self._plane_cnt]}, "
-            f"vaddr=[0x{self._virt_addr[0]:x}, 0x{self._virt_addr[1]:x}], "
-            f"size={self._size[:self._plane_cnt]}, planes={self._plane_cnt}"
-        )
+    def _set_contig_size(self, one_mapping: bool) -> None:
+        """Record the combined plane span if all planes abut within one mapping."""
+        self._contig_size = 0
+        if not one_mapping or not self._virt_addr[0]:
+            return
+        end = self._virt_addr[0] + self._size[0]
+        for i in range(1, self._plane_cnt):
+            if self._virt_addr[i] != end:
+                return
+            end += self._size[i]
+        self._contig_size = end - self._virt_addr[0]
 
     @property
     def phys_addr(self) -> list[int]:
@@ -610,9 +868,17 @@ class HbMemGraphicBuffer:
     @property
     def stride(self) -> int:
         """Buffer stride (from raw descriptor)."""
-        if self._out_buf:
-            return struct.unpack_from("<i", bytes(self._out_buf), _GRAPH_BUF_LAYOUT["stride"])[0]
-        return 0
+        return self._stride
+
+    @property
+    def width(self) -> int:
+        """Frame width in pixels (from raw descriptor)."""
+        return self._width
+
+    @property
+    def height(self) -> int:
+        """Frame height in pixels (from raw descriptor)."""
+        return self._height
 
     def invalidate_cache(self, plane: int = -1) -> None:
         """
@@ -621,23 +887,34 @@ class HbMemGraphicBuffer:
         Args:
             plane: Plane index (0=Y, 1=UV), or -1 for all planes
         """
-        lib = _load_libhbmem()
-        if lib is None or not self._imported:
+        if _hb_invalidate is None or not self._imported:
             return
 
         if plane < 0:
+            if self._contig_size:
+                # Planes are back-to-back in one mapping: one call covers Y+UV
+                ret = _hb_invalidate(self._virt_addr[0], self._contig_size)
+                if ret == 0:
+                    self._invalidated = [True, True, True]
+                    return
+                logger.debug(f"Y+UV invalidate failed ({ret}), invalidating per plane")
             for i in range(self._plane_cnt):
                 if self._virt_addr[i] and self._size[i]:
-                    lib.hb_mem_invalidate_buf_with_vaddr(
-                        c_uint64(self._virt_addr[i]),
-                        c_uint64(self._size[i]),
-                    )
+                    _hb_invalidate(self._virt_addr[i], self._size[i])
+            self._invalidated = [True, True, True]
         else:
-            if self._virt_addr[plane] and self._size[plane]:
-                lib.hb_mem_invalidate_buf_with_vaddr(
-                    c_uint64(self._virt_addr[plane]),
-                    c_uint64(self._size[plane]),
-                )
+            vaddr = self._virt_addr[plane]
+            size = self._size[plane]
+            if vaddr and size:
+                if self._contig_size:
+                    # A plane boundary inside the shared mapping may split a
+                    # cache line: pass whole lines, staying within the mapping
+                    base = self._virt_addr[0]
+                    vaddr, size = _align_to_cache_lines(
+                        vaddr, size, base, base + self._contig_size
+                    )
+                _hb_invalidate(vaddr, size)
+            self._invalidated[plane] = True
 
     @property
     def virt_addr(self) -> list[int]:
@@ -649,15 +926,24 @@ class HbMemGraphicBuffer:
         """Sizes per plane in bytes (read-only)."""
         return self._size
 
-    def get_plane_array(self, plane: int) -> np.ndarray:
+    def get_plane_array(self, plane: int, shaped: bool = False) -> np.ndarray:
         """
         Get a plane as a numpy array (zero-copy view).
 
+        The plane's cache is invalidated on first access after import, so a
+        consumer that only reads Y never pays for the UV plane.
+
         Args:
             plane: Plane index (0=Y, 1=UV)
+            shaped: Return a 2-D (rows, stride) view instead of a flat one.
+                Rows are plane_size // stride (vstride for Y, half for NV12
+                UV); slice [:, :width] for the visible pixels.
 
         Returns:
             Numpy array view of the plane data
+
+        Raises:
+            ValueError: shaped is set but the buffer has no stride
         """
         if not self._imported:
             raise RuntimeError("Buffer not imported or already released")
@@ -668,9 +954,38 @@ class HbMemGraphicBuffer:
         size = self._size[plane]
         if vaddr == 0 or size == 0:
             raise RuntimeError(f"Plane {plane} has no data (vaddr=0x{vaddr:x}, size={size})")
+        stride = self._stride
+        if shaped and stride <= 0:
+            raise ValueError(f"Plane {plane} has no stride (stride={stride}) for a shaped view")
+
+        if not self._invalidated[plane]:
+            self.invalidate_cache(plane)
 
-        arr = _get_array_type(size).from_address(vaddr)
-        return np.ctypeslib.as_array(arr)
+        if shaped:
+            rows = size // stride
+            return _vaddr_to_ndarray(vaddr, rows * stride).reshape(rows, stride)
+        return _vaddr_to_ndarray(vaddr, size)
+
+    def get_nv12_array(self) -> Optional[np.ndarray]:
+        """
+        Get Y+UV as one flat zero-copy view when the planes are back-to-back.
+
+        The whole span is invalidated in a single call. Y is view[:plane_size[0]],
+        UV the rest.
+
+        Returns:
+            Numpy array over all planes, or None if the planes are not
+            back-to-back within one mapping (use get_plane_array per plane)
+        """
+        if not self._imported:
+            raise RuntimeError("Buffer not imported or already released")
+        if self._plane_cnt < 2 or not self._contig_size:
+            return None
+
+        if not all(self._invalidated[:self._plane_cnt]):
+            self.invalidate_cache()
+
+        return _vaddr_to_ndarray(self._virt_addr[0], self._contig_size)
 
     def release(self) -> None:
         """
@@ -681,20 +996,16 @@ class HbMemGraphicBuffer:
         if not self._imported:
             return
 
-        lib = _load_libhbmem()
-        if lib is not None:
-            released_fds: set[int] = set()
-            for i in range(self._plane_cnt):
-                fd = self._fd[i]
-                if fd > 0 and fd not in released_fds:
-                    ret = lib.hb_mem_free_buf(c_int32(fd))
-                    if ret != 0:
-                        logger.warning(f"hb_mem_free_buf(fd={fd}) failed: {ret}")
-                    released_fds.add(fd)
+        if _hb_free_buf is not None:
+            for fd in self._fds_to_free:
+                ret = _hb_free_buf(fd)
+                if ret != 0:
+                    logger.warning(f"hb_mem_free_buf(fd={fd}) failed: {ret}")
 
         self._imported = False
         self._com_buf = None
-        logger.debug(f"Released buffer: fd={self._fd[:self._plane_cnt]}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Released buffer: fd={self._fd[:self._plane_cnt]}")
 
     def __del__(self):
         self.release()
@@ -745,9 +1056,8 @@ def import_nv12_graph_buf(
     """
     buf = HbMemGraphicBuffer(raw_buf_data)
     try:
-        # Invalidate cache before reading
-        buf.invalidate_cache()
-
+        # Cache invalidation happens per returned view: get_plane_array does it
+        # lazily, get_nv12_array invalidates Y+UV in one call
         y_vaddr = buf.virt_addr[0]
         uv_vaddr = buf.virt_addr[1]
         y_size = buf.plane_size[0]
@@ -761,15 +1071,13 @@ def import_nv12_graph_buf(
             y_std = float(np.std(y_arr_diag))  # type: ignore[attr-defined]
             logger.debug(f"Frame data diagnostic: Y plane mean={y_mean:.1f}, std={y_std:.1f}")
 
-        # Check if Y and UV planes are contiguous in virtual memory
-        if uv_vaddr == y_vaddr + y_size:
-            # Contiguous: create single NV12 view (zero-copy, no concatenate needed)
-            nv12_size = y_size + uv_size
-            nv12_arr = np.ctypeslib.as_array(_get_array_type(nv12_size).from_address(y_vaddr))  # type: ignore[attr-defined]
+        # Contiguous Y/UV: single NV12 view (zero-copy, no concatenate needed)
+        nv12_arr = buf.get_nv12_array()
+        if nv12_arr is not None:
             uv_arr = nv12_arr[y_size:]  # slice view, no copy
             if not _import_state.get("contiguous_logged"):
                 _import_state["contiguous_logged"] = True
-                logger.debug(f"NV12 contiguous buffer: Y+UV={nv12_size} bytes, zero-copy view")
+                logger.debug(f"NV12 contiguous buffer: Y+UV={len(nv12_arr)} bytes, zero-copy view")
             y_arr = nv12_arr
         else:
             # Non-contiguous: separate views (fallback)
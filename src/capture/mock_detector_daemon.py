@@ -6,6 +6,7 @@ This daemon reads frames from camera daemon and writes dummy detection results
 to the detection shared memory for testing the monitor overlay.
 """
 
+import itertools
 import sys
 import time
 import random
@@ -17,7 +18,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 sys.path.insert(0, str(Path(__file__).parent.parent / "common" / "src"))
 
 from common.types import DetectionDict
-from real_shared_memory import RealSharedMemory
+from real_shared_memory import DetectionWriter, ZeroCopySharedMemory
 
 # Detection classes
 CLASSES = ["cat", "food_bowl", "water_bowl"]
@@ -29,21 +30,28 @@ CLASS_PROBS = {
     "water_bowl": 0.15,
 }
 
+# Precomputed cumulative weights: random.choices skips re-accumulating them
+_CLASS_NAMES = list(CLASS_PROBS.keys())
+_CLASS_CUM_WEIGHTS = list(itertools.accumulate(CLASS_PROBS.values()))
+_NUM_DETECTIONS = [0, 1, 2, 3]
+_NUM_DETECTIONS_CUM_WEIGHTS = list(itertools.accumulate([0.2, 0.5, 0.2, 0.1]))
+
 
 def generate_dummy_detections(frame_width: int, frame_height: int, num_detections: int | None = None) -> list[DetectionDict]:
     """Generate dummy detection results with random variations"""
     if num_detections is None:
         # Randomly decide number of detections (0-3)
         # 検出なし/1個/2個/3個の確率を調整（より変化が見えるように）
-        num_detections = random.choices([0, 1, 2, 3], weights=[0.2, 0.5, 0.2, 0.1])[0]
+        num_detections = random.choices(_NUM_DETECTIONS, cum_weights=_NUM_DETECTIONS_CUM_WEIGHTS)[0]
 
-    detections = []
+    detections: list[DetectionDict] = []
 
-    for _ in range(num_detections):
-        # Choose class based on probability
-        class_name = random.choices(list(CLASS_PROBS.keys()),
-                                    weights=list(CLASS_PROBS.values()))[0]
+    # Choose classes based on probability (one draw for all detections)
+    class_names = random.choices(_CLASS_NAMES, cum_weights=_CLASS_CUM_WEIGHTS, k=num_detections)
 
+    # Boxes and confidences stay per-detection random calls: with at most 3
+    # detections a numpy Generator batch would cost more than it saves
+    for class_name in class_names:
         # Generate random bounding box with more variation
         if class_name == "cat":
             # Cat: medium to large size, anywhere
@@ -85,20 +93,19 @@ def main():
     print("Reading frames from camera daemon and writing dummy detections")
     print()
 
-    # Open shared memory
-    shm = RealSharedMemory()
+    # Open shared memory (frame metadata only; pixels are never read)
+    shm = ZeroCopySharedMemory()
+    writer = DetectionWriter()
     connected = False
     for i in range(20):
-        try:
-            shm.open()
-            shm.open_detection_write()
+        if shm.open():
+            writer.open()
             print("[Info] Connected to shared memory")
             connected = True
             break
-        except Exception:
-            print(f"[Info] Waiting for shared memory... ({i+1}/20)")
-            time.sleep(1.0)
-    
+        print(f"[Info] Waiting for shared memory... ({i+1}/20)")
+        time.sleep(1.0)
+
     if not connected:
         print("[Error] Failed to open shared memory after retries")
         print("[Error] Make sure camera daemon is running")
@@ -122,7 +129,7 @@ def main():
     try:
         while running[0]:
             # Read latest frame
-            frame = shm.get_latest_frame()
+            frame = shm.get_frame()
 
             if frame is None:
                 time.sleep(0.01)
@@ -140,7 +147,7 @@ def main():
 
             # Write to shared memory (ALWAYS, even if no detections)
             # This ensures the monitor sees the change
-            shm.write_detection_result(
+            writer.write_detection_result(
                 frame_number=frame.frame_number,
                 timestamp_sec=frame.timestamp_sec,
                 detections=detections
@@ -160,6 +167,7 @@ def main():
     except KeyboardInterrupt:
         print("\n[Info] Interrupted")
     finally:
+        writer.close()
         shm.close()
         print(f"[Info] Total detections written: {detection_count}")
         print("[Info] Detector daemon stopped")
@@ -121,6 +121,10 @@ class CLatestDetectionResult(Structure):
         ("detection_update_sem", c_uint8 * 32),
     ]
 
+# Bytes written per detection update: everything before the semaphore, which
+# belongs to the C side and must not be overwritten from Python
+_DETECTION_PAYLOAD_SIZE = CLatestDetectionResult.detection_update_sem.offset
+
 
 # ============================================================================
 # Python dataclass for frame metadata
@@ -245,6 +249,9 @@ class DetectionWriter:
         self.detection_fd: Optional[int] = None
         self.detection_mmap: Optional[mmap.mmap] = None
         self.last_detection_version = 0
+        # Reused staging struct + byte view (no per-write struct/bytes allocation)
+        self._c_det = CLatestDetectionResult()
+        self._c_det_bytes = memoryview(self._c_det).cast("B")[:_DETECTION_PAYLOAD_SIZE]
 
     def open(self) -> None:
         shm_path = f"/dev/shm{self.detection_shm_name}"
@@ -271,7 +278,8 @@ class DetectionWriter:
     ) -> None:
         if not self.detection_mmap:
             return
-        c_det = CLatestDetectionResult()
+        c_det = self._c_det
+        ctypes.memset(ctypes.addressof(c_det), 0, _DETECTION_PAYLOAD_SIZE)
         c_det.frame_number = frame_number
         c_det.timestamp = timestamp_sec
         c_det.num_detections = min(len(detections), MAX_DETECTIONS)
@@ -280,7 +288,7 @@ class DetectionWriter:
             name_bytes = det["class_name"].encode("utf-8")[:31]
             ctypes.memmove(c_detection.class_name, name_bytes, len(name_bytes))
             # bytes beyond len(name_bytes) up to index 31 are already zero
-            # because CLatestDetectionResult() zero-initialises its buffer
+            # because the staging struct is cleared above
             c_detection.confidence = det["confidence"]
             c_detection.bbox.x = det["bbox"]["x"]
             c_detection.bbox.y = det["bbox"]["y"]
@@ -288,6 +296,5 @@ class DetectionWriter:
             c_detection.bbox.h = det["bbox"]["h"]
         self.last_detection_version += 1
         c_det.version = self.last_detection_version
-        self.detection_mmap.seek(0)
-        self.detection_mmap.write(bytes(c_det))
+        self.detection_mmap[:_DETECTION_PAYLOAD_SIZE] = self._c_det_bytes
         self.detection_mmap.flush()
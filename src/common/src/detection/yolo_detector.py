@@ -7,14 +7,18 @@ MockDetectorと同じインターフェースを提供
 """
 from __future__ import annotations
 
+import ctypes
 import os
 import sys
+import time
 from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Optional, TYPE_CHECKING
 import logging
 
 if TYPE_CHECKING:
+    from email.message import Message
+
     from hb_mem_bindings import HbMemGraphicBuffer
 
 import cv2
@@ -45,11 +49,12 @@ class HWPreprocessor(Preprocessor):
     """
 
     def __init__(self, detector: "YoloDetector", lib_path: str = "") -> None:
-        import ctypes
         self._detector = detector
         self._ctx = None
         self._lib = None
         self._hb_buf = None  # Current frame's HbMemGraphicBuffer
+        self._out_arr_type = None  # ctypes c_uint8 array type for the output size
+        self._out_arr_len = 0  # Length _out_arr_type was built for
 
         if not lib_path:
             lib_path = str(Path(__file__).parents[4] / "build" / "libn2d_letterbox.so")
@@ -91,8 +96,6 @@ class HWPreprocessor(Preprocessor):
 
     def letterbox(self, nv12_array: np.ndarray, width: int, height: int,
                   pad_top: int, pad_bottom: int) -> np.ndarray:
-        import ctypes
-
         dst_h = height + pad_top + pad_bottom
         buf = self._hb_buf
 
@@ -110,8 +113,13 @@ class HWPreprocessor(Preprocessor):
                     self._ctx, phys_y, phys_uv, stride,
                     ctypes.byref(out_ptr), ctypes.byref(out_size))
                 if ret == 0 and out_ptr.value:
-                    arr_type = ctypes.c_uint8 * out_size.value
-                    return np.ctypeslib.as_array(arr_type.from_address(out_ptr.value))
+                    # Output size is fixed per ctx: build the array type once
+                    arr_type = self._out_arr_type
+                    if arr_type is None or self._out_arr_len != out_size.value:
+                        arr_type = ctypes.c_uint8 * out_size.value
+                        self._out_arr_type = arr_type
+                        self._out_arr_len = out_size.value
+                    return np.frombuffer(arr_type.from_address(out_ptr.value), dtype=np.uint8)
 
         raise RuntimeError("HWPreprocessor: nano2D letterbox failed")
 
@@ -269,6 +277,13 @@ class YoloDetector:
         input_size: 入力画像サイズ（デフォルト: 640x640）
     """
 
+    # auto_download時に取得するデフォルトモデル
+    DEFAULT_MODEL_URL = "https://archive.d-robotics.cc/downloads/rdk_model_zoo/rdk_x5/ultralytics_YOLO/yolov13n_detect_bayese_640x640_nv12.bin"
+    # 設定するとダウンロード後にSHA256を検証する（Noneなら検証しない）
+    DEFAULT_MODEL_SHA256: Optional[str] = None
+    # ダウンロード時の読み込みチャンクサイズ
+    DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
     def __init__(
         self,
         model_path: str,
@@ -421,19 +436,109 @@ class YoloDetector:
         self._clahe_y_cache.clear()
 
     def _download_default_model(self) -> None:
-        """デフォルトモデル（YOLOv13n）をダウンロード"""
+        """デフォルトモデル（YOLOv13n）をダウンロード
+
+        <model>.part へチャンク単位で書き込み、完了後にrenameする。
+        中断された .part が残っていれば Range リクエストで続きから再開する
+        （低速回線で途中失敗しても最初からやり直さない）。
+        再開時は最初のレスポンスの ETag / Last-Modified を If-Range で送り、
+        サーバ側のファイルが差し替わっていれば先頭から取り直す。
+        """
+        import hashlib
+        import urllib.error
         import urllib.request
 
-        url = "https://archive.d-robotics.cc/downloads/rdk_model_zoo/rdk_x5/ultralytics_YOLO/yolov13n_detect_bayese_640x640_nv12.bin"
+        url = self.DEFAULT_MODEL_URL
+        model_path = Path(self.model_path)
+        part_path = model_path.with_name(model_path.name + ".part")
+        # .part の取得元を識別する validator (ETag or Last-Modified)
+        validator_path = model_path.with_name(model_path.name + ".part.validator")
 
         # 保存先ディレクトリを作成
-        model_dir = Path(self.model_path).parent
-        model_dir.mkdir(parents=True, exist_ok=True)
+        model_path.parent.mkdir(parents=True, exist_ok=True)
 
         logger.info(f"Downloading YOLO model from {url}...")
-        urllib.request.urlretrieve(url, self.model_path)
+        # 2回目は .part を捨てた後の先頭からの取り直し
+        for _ in range(2):
+            validator = (
+                validator_path.read_text().strip() if validator_path.exists() else ""
+            )
+            # validator の無い .part は取得元を確かめられないので再開しない
+            offset = part_path.stat().st_size if part_path.exists() and validator else 0
+            request = urllib.request.Request(url)
+            if offset:
+                request.add_header("Range", f"bytes={offset}-")
+                request.add_header("If-Range", validator)
+
+            try:
+                with urllib.request.urlopen(request, timeout=30) as response:
+                    if offset and response.status != 206:
+                        # Range非対応 or If-Range不一致 (ファイル更新) → 先頭から取り直し
+                        offset = 0
+                    if offset:
+                        logger.info(f"Resuming download at {offset} bytes")
+                    else:
+                        self._save_download_validator(validator_path, response.headers)
+                    with open(part_path, "ab" if offset else "wb") as f:
+                        while chunk := response.read(self.DOWNLOAD_CHUNK_SIZE):
+                            f.write(chunk)
+            except urllib.error.HTTPError as e:
+                # 416: .part が既に全体を含んでいる（はず）
+                if not (offset and e.code == 416):
+                    raise
+                # SHA256 が無ければサイズと validator をHEADで確認し、
+                # 合わなければ .part を捨てて取り直す
+                if not self.DEFAULT_MODEL_SHA256 and not self._remote_matches_part(
+                    url, offset, validator
+                ):
+                    logger.warning("Partial model download does not match server, restarting")
+                    part_path.unlink()
+                    validator_path.unlink(missing_ok=True)
+                    continue
+            break
+
+        if self.DEFAULT_MODEL_SHA256:
+            digest = hashlib.sha256()
+            with open(part_path, "rb") as f:
+                while chunk := f.read(self.DOWNLOAD_CHUNK_SIZE):
+                    digest.update(chunk)
+            if digest.hexdigest() != self.DEFAULT_MODEL_SHA256.lower():
+                part_path.unlink()
+                validator_path.unlink(missing_ok=True)
+                raise RuntimeError(
+                    f"Model checksum mismatch: {digest.hexdigest()} "
+                    f"(expected {self.DEFAULT_MODEL_SHA256})"
+                )
+
+        os.replace(part_path, model_path)
+        validator_path.unlink(missing_ok=True)
         logger.info(f"Model downloaded: {self.model_path}")
 
+    @staticmethod
+    def _save_download_validator(validator_path: Path, headers: Message) -> None:
+        """先頭からのレスポンスの ETag / Last-Modified を保存（無ければ削除）"""
+        validator = headers.get("ETag") or headers.get("Last-Modified")
+        if validator:
+            validator_path.write_text(validator)
+        else:
+            validator_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _remote_matches_part(url: str, size: int, validator: str) -> bool:
+        """HEAD で取得したサーバ側のサイズ・validator が .part と一致するか"""
+        import urllib.request
+
+        request = urllib.request.Request(url, method="HEAD")
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                length = response.headers.get("Content-Length")
+                current = response.headers.get("ETag") or response.headers.get(
+                    "Last-Modified"
+                )
+        except OSError:
+            return False
+        return length is not None and int(length) == size and current == validator
+
     def _init_yolo26_grids(self) -> None:
         """YOLO26用のAnchor-Freeグリッドを事前計算
 
@@ -648,8 +753,6 @@ class YoloDetector:
         Returns:
             検出結果のリスト (座標は元画像座標系)
         """
-        import time
-
         start_total = time.perf_counter()
         self._total_calls += 1
 
@@ -776,8 +879,6 @@ class YoloDetector:
         Returns:
             検出結果のリスト
         """
-        import time
-
         start_total = time.perf_counter()
         self._total_calls += 1
 
@@ -932,6 +1033,20 @@ class YoloDetector:
         outputs = self._forward(input_tensor)
         return self._postprocess(outputs, scale, shift, original_shape)
 
+    def warmup(self, iterations: int = 1) -> None:
+        """ダミー入力でBPU推論を空回しする
+
+        初回のforwardはBPU側の初期化で遅く、平均推論時間などの統計を歪めるため、
+        計測対象のフレームを処理する前に一度実行しておく。
+        detect_nv12_readonly経由なので統計・CLAHE状態は変更しない。
+
+        Args:
+            iterations: 空回しする回数
+        """
+        dummy = np.zeros(self.input_w * self.input_h * 3 // 2, dtype=np.uint8)
+        for _ in range(iterations):
+            self.detect_nv12_readonly(dummy, self.input_w, self.input_h)
+
     def _apply_clahe_nv12(
         self, nv12_array: np.ndarray, width: int, height: int,
         update_cache: bool = True,
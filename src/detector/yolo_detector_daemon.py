@@ -713,6 +713,13 @@ class YoloDetectorDaemon:
             logger.error(f"Failed to load YOLO model: {e}")
             raise
 
+        # 初回推論の遅延を最初の実フレームに持ち込まない
+        try:
+            self.detector.warmup()
+            logger.debug("YOLO warm-up inference done")
+        except Exception as e:
+            logger.warning(f"YOLO warm-up failed: {e}")
+
         # HW preprocessor (nano2D letterbox on GPU)
         try:
             from detection.yolo_detector import HWPreprocessor
@@ -896,46 +903,49 @@ class YoloDetectorDaemon:
         assert self.detection_writer is not None
         assert self.scale_x is not None and self.scale_y is not None
 
-        if self.roi_enabled and len(self.roi_regions) > 1:
-            current_roi = self.roi_index
-            roi_x, roi_y, roi_w, roi_h = self.roi_regions[current_roi]
-            detections = self.detector.detect_nv12_roi(
-                nv12_data=nv12_data,
-                width=zc_frame.width,  # type: ignore[attr-defined]
-                height=zc_frame.height,  # type: ignore[attr-defined]
-                roi_x=roi_x,
-                roi_y=roi_y,
-                roi_w=roi_w,
-                roi_h=roi_h,
-                brightness_avg=zc_frame.brightness_avg,  # type: ignore[attr-defined]
-            )
-            if current_roi == 0:
-                self.cache_frame_number = zc_frame.frame_number  # type: ignore[attr-defined]
-                self.cache_timestamp = zc_frame.timestamp_sec  # type: ignore[attr-defined]
-            self.roi_index = (self.roi_index + 1) % len(self.roi_regions)
-            cycle_complete = self.roi_index == 0
-        else:
-            detections = self.detector.detect_nv12(
-                nv12_data=nv12_data,
-                width=zc_frame.width,  # type: ignore[attr-defined]
-                height=zc_frame.height,  # type: ignore[attr-defined]
-                brightness_avg=zc_frame.brightness_avg,  # type: ignore[attr-defined]
-            )
-            current_roi = -1
-            cycle_complete = True
-
-        # Day motion: crop active zone from Y plane before releasing buffer
-        if self.active_camera == 0 and self._day_active_zone >= 0:
-            zx, zy, zw, zh = DAY_MOTION_ZONES[self._day_active_zone]
-            y_plane = nv12_data[: zc_frame.width * zc_frame.height].reshape(  # type: ignore[attr-defined]
-                zc_frame.height,
-                zc_frame.width,  # type: ignore[attr-defined]
-            )
-            self._day_zone_current = y_plane[zy : zy + zh, zx : zx + zw].copy()
-        else:
-            self._day_zone_current = None
-
-        hb_mem_buffer.release()  # type: ignore[attr-defined]
+        # nv12_data and the Y-plane crop are views into the VIO buffer; release it
+        # once they are done with, even when detection or the crop raises
+        try:
+            if self.roi_enabled and len(self.roi_regions) > 1:
+                current_roi = self.roi_index
+                roi_x, roi_y, roi_w, roi_h = self.roi_regions[current_roi]
+                detections = self.detector.detect_nv12_roi(
+                    nv12_data=nv12_data,
+                    width=zc_frame.width,  # type: ignore[attr-defined]
+                    height=zc_frame.height,  # type: ignore[attr-defined]
+                    roi_x=roi_x,
+                    roi_y=roi_y,
+                    roi_w=roi_w,
+                    roi_h=roi_h,
+                    brightness_avg=zc_frame.brightness_avg,  # type: ignore[attr-defined]
+                )
+                if current_roi == 0:
+                    self.cache_frame_number = zc_frame.frame_number  # type: ignore[attr-defined]
+                    self.cache_timestamp = zc_frame.timestamp_sec  # type: ignore[attr-defined]
+                self.roi_index = (self.roi_index + 1) % len(self.roi_regions)
+                cycle_complete = self.roi_index == 0
+            else:
+                detections = self.detector.detect_nv12(
+                    nv12_data=nv12_data,
+                    width=zc_frame.width,  # type: ignore[attr-defined]
+                    height=zc_frame.height,  # type: ignore[attr-defined]
+                    brightness_avg=zc_frame.brightness_avg,  # type: ignore[attr-defined]
+                )
+                current_roi = -1
+                cycle_complete = True
+
+            # Day motion: crop active zone from Y plane before releasing buffer
+            if self.active_camera == 0 and self._day_active_zone >= 0:
+                zx, zy, zw, zh = DAY_MOTION_ZONES[self._day_active_zone]
+                y_plane = hb_mem_buffer.get_plane_array(0, shaped=True)[  # type: ignore[attr-defined]
+                    : zc_frame.height,  # type: ignore[attr-defined]
+                    : zc_frame.width,  # type: ignore[attr-defined]
+                ]
+                self._day_zone_current = y_plane[zy : zy + zh, zx : zx + zw].copy()
+            else:
+                self._day_zone_current = None
+        finally:
+            hb_mem_buffer.release()  # type: ignore[attr-defined]
 
         timing = self.detector.get_last_timing()
 
@@ -1167,8 +1177,6 @@ class YoloDetectorDaemon:
         is_debug: bool,
     ) -> None:
         """Night path: motion detection → YOLO → merge → SHM write → stats."""
-        import numpy as np
-
         assert self.detector is not None
         assert self.detection_writer is not None
         assert self.scale_x is not None and self.scale_y is not None
@@ -1186,13 +1194,16 @@ class YoloDetectorDaemon:
             if motion_reader.wait_for_frame(timeout_sec=0.02):
                 mf = motion_reader.get_frame()
                 if mf is not None:
+                    m_hb_buf = None
                     try:
-                        m_y_arr, _, m_hb_buf = import_nv12_graph_buf(
+                        _, _, m_hb_buf = import_nv12_graph_buf(
                             raw_buf_data=mf.hb_mem_buf_data,
                             expected_plane_sizes=mf.plane_size,
                         )
-                        m_y_size = mf.width * mf.height
-                        y_plane = m_y_arr[:m_y_size].reshape(mf.height, mf.width)
+                        # (rows, stride) view straight from the VIO plane; stride-safe
+                        y_plane = m_hb_buf.get_plane_array(0, shaped=True)[
+                            : mf.height, : mf.width
+                        ]
 
                         # ROI 0: direct 480×480 center crop from 640×640 VSE output.
                         # cv2 functions accept strided numpy views via cv::Mat strides,
@@ -1398,11 +1409,13 @@ class YoloDetectorDaemon:
                                     pass
 
                         self._prev_roi_small[rkey] = y_small
-                        m_hb_buf.release()
                     except Exception as e:
                         logger.warning(
                             f"Motion ROI read failed (roi={motion_roi_idx}): {e}"
                         )
+                    finally:
+                        if m_hb_buf is not None:
+                            m_hb_buf.release()
 
         # Track which ROI had motion
         if motion_detected_this_frame and vse_active:
@@ -1898,8 +1911,6 @@ class YoloDetectorDaemon:
         Handles: no active SHM, semaphore timeout, invalid frame,
         plane_cnt validation, and NV12 import errors.
         """
-        import numpy as np
-
         while self.running:
             # Idle throttle — night mode only, no hb_mem held during sleep
             if self.night_roi_mode and self._quiet_frames >= self.IDLE_TIER1_FRAMES:
@@ -87,8 +87,12 @@ class MockCamera:
 
         self._cap: Optional[cv2.VideoCapture] = None  # type: ignore[attr-defined]
         self._static_image: Optional[np.ndarray] = None
+        # randomソース用: 乱数ノイズ(2フレーム分の高さ)を一度だけ生成し、
+        # 毎フレームは窓をずらして再利用バッファへコピーする
+        self._noise: Optional[np.ndarray] = None
+        self._pattern_buf: Optional[np.ndarray] = None
         self._frame_count = 0
-        self._last_capture_time = 0.0
+        self._next_capture_time = 0.0  # time.monotonic()基準の次フレーム予定時刻
 
         # ソースの初期化
         self._initialize_source(source, source_path)
@@ -147,12 +151,13 @@ class MockCamera:
         Returns:
             キャプチャされたフレーム
         """
-        # フレームレート制御
-        if not skip_rate_limit:
-            current_time = time.time()
-            elapsed = current_time - self._last_capture_time
-            if elapsed < self.frame_interval:
-                time.sleep(self.frame_interval - elapsed)
+        # フレームレート制御（絶対デッドライン方式: 処理時間によるドリフトを蓄積しない）
+        # 遅れている場合は追いつき連写せず、現在時刻から周期を再開する
+        now = time.monotonic()
+        if not skip_rate_limit and self._next_capture_time > now:
+            time.sleep(self._next_capture_time - now)
+            now = self._next_capture_time
+        self._next_capture_time = now + self.frame_interval
 
         # フレーム生成
         if self.source_type == "random":
@@ -162,7 +167,8 @@ class MockCamera:
         elif self.source_type == "webcam":
             frame_bgr = self._capture_webcam_frame()
         elif self.source_type == "image":
-            frame_bgr = self._static_image.copy()  # type: ignore
+            # imencodeは読み取りのみなのでコピー不要
+            frame_bgr = self._static_image  # type: ignore
         else:
             raise ValueError(f"Unknown source type: {self.source_type}")
 
@@ -172,7 +178,6 @@ class MockCamera:
 
         # Frameオブジェクト作成
         self._frame_count += 1
-        self._last_capture_time = time.time()
 
         return Frame(
             data=jpeg_data,
@@ -185,8 +190,18 @@ class MockCamera:
 
     def _generate_random_pattern(self) -> np.ndarray:
         """ランダムパターンを生成"""
-        # カラフルなランダムパターン
-        pattern = np.random.randint(0, 255, (self.height, self.width, 3), dtype=np.uint8)
+        # カラフルなランダムパターン（毎フレームの乱数生成・確保を避ける）
+        noise = self._noise
+        pattern = self._pattern_buf
+        if noise is None or pattern is None:
+            noise = np.random.randint(
+                0, 255, (self.height * 2, self.width, 3), dtype=np.uint8
+            )
+            pattern = np.empty((self.height, self.width, 3), dtype=np.uint8)
+            self._noise = noise
+            self._pattern_buf = pattern
+        offset = (self._frame_count * 7) % self.height
+        np.copyto(pattern, noise[offset:offset + self.height])
         # テキストを追加（フレーム番号）
         cv2.putText(
             pattern,
@@ -0,0 +1,262 @@
+"""
+hb_mem_bindings のキャッシュ無効化ロジックの単体テスト
+
+libhbmem は不要: _hb_invalidate を記録用スタブに差し替え、HbMemBuffer は
+import を経由せずに組み立てる (virt_addr は numpy 配列のアドレスを使う)。
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+import hb_mem_bindings as hb
+from hb_mem_bindings import (
+    CACHE_MODE_BYPASS,
+    CACHE_MODE_EACH_READ,
+    CACHE_MODE_ONCE,
+    HbMemBuffer,
+    HbMemGraphicBuffer,
+    _align_to_cache_lines,
+)
+
+LINE = 64
+
+
+@pytest.fixture
+def invalidate_calls(monkeypatch: pytest.MonkeyPatch) -> list[tuple[int, int]]:
+    """_hb_invalidate を (vaddr, size) の記録に差し替える (free は無効化)"""
+    calls: list[tuple[int, int]] = []
+
+    def fake_invalidate(vaddr: int, size: int) -> int:
+        calls.append((vaddr, size))
+        return 0
+
+    monkeypatch.setattr(hb, "_hb_invalidate", fake_invalidate)
+    monkeypatch.setattr(hb, "_hb_free_buf", None)
+    return calls
+
+
+def make_buffer(backing: np.ndarray, cache_mode: str = CACHE_MODE_EACH_READ) -> HbMemBuffer:
+    """backing をマッピング済みバッファに見立てた HbMemBuffer を作る"""
+    buf = object.__new__(HbMemBuffer)
+    buf._buf = hb.hb_mem_common_buf_t()
+    buf._buf.virt_addr = backing.ctypes.data
+    buf._buf.size = backing.nbytes
+    buf._imported = True
+    buf._cache_mode = cache_mode
+    buf._invalidated = False
+    buf._invalidated_ranges = []
+    buf._np = None
+    buf._share_id = 0
+    return buf
+
+
+def make_graph_buffer(
+    backing: np.ndarray, sizes: list[int], stride: int, fds: list[int] | None = None
+) -> HbMemGraphicBuffer:
+    """backing に sizes の各プレーンを順に並べた HbMemGraphicBuffer を作る"""
+    buf = object.__new__(HbMemGraphicBuffer)
+    base = backing.ctypes.data
+    offsets = [sum(sizes[:i]) for i in range(len(sizes))]
+    buf._imported = True
+    buf._plane_cnt = len(sizes)
+    buf._fd = (fds or [1] * len(sizes)) + [0] * (3 - len(sizes))
+    buf._fds_to_free = ()
+    buf._virt_addr = [base + off for off in offsets] + [0] * (3 - len(sizes))
+    buf._size = sizes + [0] * (3 - len(sizes))
+    buf._phys_addr = [0, 0, 0]
+    buf._width = stride
+    buf._height = sizes[0] // stride if stride > 0 else 0
+    buf._stride = stride
+    buf._invalidated = [False, False, False]
+    buf._com_buf = None
+    buf._set_contig_size(one_mapping=len(set(buf._fd[:buf._plane_cnt])) == 1)
+    return buf
+
+
+def aligned_backing(size: int) -> np.ndarray:
+    """先頭がキャッシュライン境界に揃った uint8 配列"""
+    raw = np.zeros(size + LINE, dtype=np.uint8)
+    skip = -raw.ctypes.data % LINE
+    return raw[skip:skip + size]
+
+
+# ---------------------------------------------------------------------------
+# _align_to_cache_lines
+# ---------------------------------------------------------------------------
+
+def test_align_keeps_aligned_range():
+    assert _align_to_cache_lines(0x1000, 128, 0x1000, 0x2000) == (0x1000, 128)
+
+
+def test_align_widens_to_line_boundaries():
+    """先頭は切り下げ、末尾は切り上げ"""
+    assert _align_to_cache_lines(0x1000 + 10, 20, 0x1000, 0x2000) == (0x1000, 64)
+    # 行をまたぐ範囲は両端の行を含む
+    assert _align_to_cache_lines(0x1000 + 60, 10, 0x1000, 0x2000) == (0x1000, 128)
+
+
+def test_align_clamps_to_mapping():
+    """行境界に揃っていないマッピング端を越えない"""
+    lo, hi = 0x1000 + 8, 0x1000 + 100
+    assert _align_to_cache_lines(lo, 4, lo, hi) == (lo, 64 - 8)
+    assert _align_to_cache_lines(0x1000 + 90, 10, lo, hi) == (0x1000 + 64, 36)
+
+
+# ---------------------------------------------------------------------------
+# HbMemBuffer.invalidate_range
+# ---------------------------------------------------------------------------
+
+def test_invalidate_range_aligns_to_cache_lines(invalidate_calls: list[tuple[int, int]]):
+    backing = aligned_backing(256)
+    base = backing.ctypes.data
+    buf = make_buffer(backing)
+
+    buf.invalidate_range(10, 20)
+    buf.invalidate_range(60, 10)
+    assert invalidate_calls == [(base, 64), (base, 128)]
+
+
+def test_invalidate_range_clamps_to_buffer_end(invalidate_calls: list[tuple[int, int]]):
+    backing = aligned_backing(100)
+    base = backing.ctypes.data
+    buf = make_buffer(backing)
+
+    buf.invalidate_range(90, 10)
+    assert invalidate_calls == [(base + 64, 36)]
+
+
+def test_invalidate_range_rejects_out_of_bounds(invalidate_calls: list[tuple[int, int]]):
+    buf = make_buffer(aligned_backing(128))
+
+    with pytest.raises(ValueError):
+        buf.invalidate_range(100, 64)
+    with pytest.raises(ValueError):
+        buf.invalidate_range(-1, 8)
+    buf.invalidate_range(0, 0)  # 空範囲は何もしない
+    assert invalidate_calls == []
+
+
+# ---------------------------------------------------------------------------
+# cache_mode ごとの as_numpy() の無効化
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize(
+    ("cache_mode", "expected_calls"),
+    [(CACHE_MODE_EACH_READ, 3), (CACHE_MODE_ONCE, 1), (CACHE_MODE_BYPASS, 0)],
+)
+def test_as_numpy_invalidates_per_cache_mode(
+    invalidate_calls: list[tuple[int, int]], cache_mode: str, expected_calls: int
+):
+    backing = aligned_backing(256)
+    buf = make_buffer(backing, cache_mode)
+
+    for _ in range(3):
+        arr = buf.as_numpy()
+        assert arr.ctypes.data == backing.ctypes.data and arr.size == 256
+    assert len(invalidate_calls) == expected_calls
+    assert all(call == (backing.ctypes.data, 256) for call in invalidate_calls)
+
+
+def test_as_numpy_window_invalidates_aligned_range(invalidate_calls: list[tuple[int, int]]):
+    backing = aligned_backing(256)
+    base = backing.ctypes.data
+    backing[:] = np.arange(256, dtype=np.uint8)
+    buf = make_buffer(backing)
+
+    window = buf.as_numpy(offset=70, length=20)
+    assert window.tolist() == list(range(70, 90))
+    assert invalidate_calls == [(base + 64, 64)]
+
+
+def test_once_mode_window_invalidated_once(invalidate_calls: list[tuple[int, int]]):
+    backing = aligned_backing(256)
+    base = backing.ctypes.data
+    buf = make_buffer(backing, CACHE_MODE_ONCE)
+
+    buf.as_numpy(offset=70, length=20)
+    buf.as_numpy(offset=64, length=30)  # 無効化済みのキャッシュライン内
+    assert invalidate_calls == [(base + 64, 64)]
+
+    buf.as_numpy(offset=0, length=8)  # 未無効化の範囲だけ再度無効化する
+    assert invalidate_calls == [(base + 64, 64), (base, 64)]
+
+
+def test_once_mode_windows_covering_buffer_count_as_full(invalidate_calls: list[tuple[int, int]]):
+    backing = aligned_backing(256)
+    buf = make_buffer(backing, CACHE_MODE_ONCE)
+
+    buf.as_numpy(offset=0, length=128)
+    buf.as_numpy(offset=128, length=128)
+    buf.as_numpy()  # 2 つの窓でバッファ全体が無効化済み
+    assert len(invalidate_calls) == 2
+
+
+def test_unknown_cache_mode_rejected():
+    with pytest.raises(ValueError):
+        HbMemBuffer(share_id=0, expected_size=0, cache_mode="never")
+
+
+# ---------------------------------------------------------------------------
+# HbMemGraphicBuffer.get_plane_array
+# ---------------------------------------------------------------------------
+
+def test_shaped_plane_array_is_rows_by_stride(invalidate_calls: list[tuple[int, int]]):
+    backing = aligned_backing(96)
+    buf = make_graph_buffer(backing, [64, 32], stride=16)
+
+    assert buf.get_plane_array(0, shaped=True).shape == (4, 16)
+    assert buf.get_plane_array(1, shaped=True).shape == (2, 16)
+
+
+def test_shaped_plane_array_without_stride_rejected(invalidate_calls: list[tuple[int, int]]):
+    backing = aligned_backing(96)
+    buf = make_graph_buffer(backing, [64, 32], stride=0)
+
+    with pytest.raises(ValueError):
+        buf.get_plane_array(0, shaped=True)
+    assert invalidate_calls == []  # 不正な要求ではキャッシュ操作もしない
+    assert buf.get_plane_array(0).shape == (64,)  # フラットな view は従来どおり
+
+
+# ---------------------------------------------------------------------------
+# HbMemGraphicBuffer.invalidate_cache (全プレーン)
+# ---------------------------------------------------------------------------
+
+def test_planes_in_one_mapping_invalidated_in_one_call(invalidate_calls: list[tuple[int, int]]):
+    backing = aligned_backing(96)
+    buf = make_graph_buffer(backing, [64, 32], stride=16, fds=[5, 5])
+
+    buf.invalidate_cache()
+    assert invalidate_calls == [(backing.ctypes.data, 96)]
+
+
+def test_adjacent_planes_of_different_fds_invalidated_per_plane(
+    invalidate_calls: list[tuple[int, int]],
+):
+    # 仮想アドレスが隣接していても fd が違えば別のマッピング
+    backing = aligned_backing(96)
+    buf = make_graph_buffer(backing, [64, 32], stride=16, fds=[5, 6])
+
+    assert buf.get_nv12_array() is None
+    buf.invalidate_cache()
+    base = backing.ctypes.data
+    assert invalidate_calls == [(base, 64), (base + 64, 32)]
+
+
+def test_failed_combined_invalidate_falls_back_per_plane(monkeypatch: pytest.MonkeyPatch):
+    calls: list[tuple[int, int]] = []
+
+    def fake_invalidate(vaddr: int, size: int) -> int:
+        calls.append((vaddr, size))
+        return -1 if size == 96 else 0  # Y+UV まとめての呼び出しだけ失敗させる
+
+    monkeypatch.setattr(hb, "_hb_invalidate", fake_invalidate)
+    backing = aligned_backing(96)
+    buf = make_graph_buffer(backing, [64, 32], stride=16, fds=[5, 5])
+
+    buf.invalidate_cache()
+    base = backing.ctypes.data
+    assert calls == [(base, 96), (base, 64), (base + 64, 32)]
+    assert buf._invalidated == [True, True, True]
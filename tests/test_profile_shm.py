@@ -0,0 +1,78 @@
+"""
+scripts/profile_shm.py の IframeSaver の単体テスト
+
+JPEG 保存 (save_iframe_jpeg) を Event 待ちのスタブに差し替え、保存待ちが
+上限に達している間のフレームがコピーされずにスキップ・計数されることを確認する。
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "profile_shm.py"
+_spec = importlib.util.spec_from_file_location("profile_shm", SCRIPT)
+assert _spec is not None and _spec.loader is not None
+profile_shm = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(profile_shm)
+
+WIDTH, HEIGHT = 4, 2
+Y_SIZE = WIDTH * HEIGHT
+
+
+@pytest.fixture
+def blocked_saves(monkeypatch: pytest.MonkeyPatch) -> threading.Event:
+    """save_iframe_jpeg を、返される Event が set されるまで戻らないスタブにする"""
+    release = threading.Event()
+
+    def fake_save(nv12_data: bytes, width: int, height: int, filepath: Path) -> bool:
+        assert len(nv12_data) == Y_SIZE * 3 // 2
+        return release.wait(timeout=5.0)
+
+    monkeypatch.setattr(profile_shm, "save_iframe_jpeg", fake_save)
+    return release
+
+
+def nv12_planes() -> tuple[np.ndarray, np.ndarray]:
+    return np.zeros(Y_SIZE, dtype=np.uint8), np.zeros(Y_SIZE // 2, dtype=np.uint8)
+
+
+def test_submit_skips_frames_while_pending_saves_are_full(
+    blocked_saves: threading.Event, tmp_path: Path
+) -> None:
+    saver = profile_shm.IframeSaver(max_workers=1, max_pending=2)
+    y_arr, uv_arr = nv12_planes()
+
+    # 実行中 1 + 待ち 1 で上限に達し、以降のフレームはスキップされる
+    results = [
+        saver.submit(y_arr, uv_arr, Y_SIZE, WIDTH, HEIGHT, tmp_path / f"{i}.jpg")
+        for i in range(4)
+    ]
+    assert results == [True, True, False, False]
+    assert saver.skipped == 2
+    assert saver.submitted == 2
+
+    blocked_saves.set()
+    assert saver.close() == 2
+
+
+def test_submit_accepts_frames_again_after_saves_finish(
+    blocked_saves: threading.Event, tmp_path: Path
+) -> None:
+    saver = profile_shm.IframeSaver(max_workers=1, max_pending=1)
+    y_arr, uv_arr = nv12_planes()
+
+    assert saver.submit(y_arr, uv_arr, Y_SIZE, WIDTH, HEIGHT, tmp_path / "0.jpg")
+    assert not saver.submit(y_arr, uv_arr, Y_SIZE, WIDTH, HEIGHT, tmp_path / "1.jpg")
+
+    # 保存が終わればスロットが戻る
+    blocked_saves.set()
+    saver._futures[0].result(timeout=5.0)
+    assert saver.submit(y_arr, uv_arr, Y_SIZE, WIDTH, HEIGHT, tmp_path / "2.jpg")
+
+    assert saver.close() == 2
+    assert saver.skipped == 1